@@ -30,10 +30,10 @@ hiddenimports = [
     'geopy',
     'geographiclib',
     'schedule',
-    'ping3',
     'numpy',
     'serial',
     'requests',
+    'orjson',
     'urllib3',
     'sqlite3',
     'threading',
@@ -61,7 +61,7 @@ a = Analysis(
     runtime_hooks=[],
     excludes=[],
     noarchive=False,
-    optimize=0,
+    optimize=2,
 )
 
 pyz = PYZ(a.pure)
@@ -1,5 +1,7 @@
 import unittest
 from unittest import mock
+import base64
+import json
 import time
 
 
@@ -24,7 +26,7 @@ class TestApiClient(unittest.TestCase):
     def test_session_created_with_retry(self):
         client = self.api.ApiClient()
         with mock.patch('utils.api_client.requests.Session') as mock_sess, \
-             mock.patch('utils.api_client.HTTPAdapter') as mock_adapter, \
+             mock.patch('utils.api_client.KeepAliveAdapter') as mock_adapter, \
              mock.patch('utils.api_client.Retry') as mock_retry:
             s = mock.MagicMock()
             mock_sess.return_value = s
@@ -34,6 +36,25 @@ class TestApiClient(unittest.TestCase):
             mock_adapter.assert_called()
             s.mount.assert_called()
 
+    def test_keepalive_adapter_socket_options(self):
+        import socket
+        adapter = self.api.KeepAliveAdapter()
+        opts = adapter.poolmanager.connection_pool_kw['socket_options']
+        self.assertIn((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1), opts)
+        self.assertIn((socket.IPPROTO_TCP, socket.TCP_NODELAY, 1), opts)
+
+    def test_session_reused_and_closed(self):
+        client = self.api.ApiClient()
+        client.health_url = 'https://example/health'
+        with mock.patch.object(client, 'http') as sess, \
+             mock.patch.object(client, '_headers', return_value={}):
+            sess.post.return_value.content = json.dumps({'isSuccess': True, 'status': 'Ok'}).encode()
+            client.upload_health(True, 'Connected', 1.0, 2.0)
+            client.upload_health(True, 'Connected', 1.0, 2.0)
+            self.assertEqual(sess.post.call_count, 2)
+            sess.close.assert_not_called()
+            client.close()
+            sess.close.assert_called_once()
 
     def test_refresh_token_success(self):
         client = self.api.ApiClient()
@@ -41,9 +62,7 @@ class TestApiClient(unittest.TestCase):
         client.client_id = 'test_client_id'
         client.client_secret = 'test_client_secret'
         client.audience = 'test_audience'
-        with mock.patch.object(client, '_session') as ms:
-            sess = mock.MagicMock()
-            ms.return_value = sess
+        with mock.patch.object(client, 'http') as sess:
             resp = mock.MagicMock()
             resp.status_code = 200
             resp.json.return_value = {
@@ -55,7 +74,7 @@ class TestApiClient(unittest.TestCase):
             self.assertTrue(ok)
             self.assertEqual(client.token, 'test_token')
             self.assertGreater(client.token_expires_at, time.time())
-            sess.close.assert_called()
+            sess.close.assert_not_called()
 
     def test_refresh_token_failure_and_no_url(self):
         client = self.api.ApiClient()
@@ -63,9 +82,7 @@ class TestApiClient(unittest.TestCase):
         client.client_id = 'test_client_id'
         client.client_secret = 'test_client_secret'
         client.audience = 'test_audience'
-        with mock.patch.object(client, '_session') as ms:
-            sess = mock.MagicMock()
-            ms.return_value = sess
+        with mock.patch.object(client, 'http') as sess:
             resp = mock.MagicMock()
             resp.status_code = 400
             resp.raise_for_status.side_effect = Exception('Bad request')
@@ -78,23 +95,21 @@ class TestApiClient(unittest.TestCase):
         client = self.api.ApiClient()
         client.health_url = 'https://example/health'
         client.user_name = 'User'
-        with mock.patch.object(client, '_session') as ms, \
+        with mock.patch.object(client, 'http') as sess, \
              mock.patch.object(client, '_headers', return_value={'Authorization': 'x'}):
-            sess = mock.MagicMock()
-            ms.return_value = sess
             # Test new API format success
             ok_resp = mock.MagicMock()
-            ok_resp.json.return_value = {'isSuccess': True, 'status': 'Ok'}
+            ok_resp.content = json.dumps({'isSuccess': True, 'status': 'Ok'}).encode()
             sess.post.return_value = ok_resp
             self.assertTrue(client.upload_health(True, 'Connected', 1.0, 2.0))
             # Test legacy API format success
             legacy_resp = mock.MagicMock()
-            legacy_resp.json.return_value = {'metadata': {'code': '200'}}
+            legacy_resp.content = json.dumps({'metadata': {'code': '200'}}).encode()
             sess.post.return_value = legacy_resp
             self.assertTrue(client.upload_health(True, 'Connected', 1.0, 2.0))
             # Test failure
             bad_resp = mock.MagicMock()
-            bad_resp.json.return_value = {'isSuccess': False, 'status': 'Error'}
+            bad_resp.content = json.dumps({'isSuccess': False, 'status': 'Error'}).encode()
             sess.post.return_value = bad_resp
             self.assertFalse(client.upload_health(True, 'Connected', 1.0, 2.0))
         client.health_url = None
@@ -116,33 +131,70 @@ class TestApiClient(unittest.TestCase):
                 "antenna": 1
             }
         ]
-        with mock.patch.object(client, '_session') as ms, \
+        with mock.patch.object(client, 'http') as sess, \
              mock.patch.object(client, '_headers', return_value={'Authorization': 'x'}):
-            sess = mock.MagicMock()
-            ms.return_value = sess
             # Test new API format success
             ok_resp = mock.MagicMock()
-            ok_resp.json.return_value = {'isSuccess': True, 'status': 'Ok'}
+            ok_resp.content = json.dumps({'isSuccess': True, 'status': 'Ok'}).encode()
             sess.post.return_value = ok_resp
             self.assertTrue(client.upload_records(payload))
             # Test legacy API format success
             legacy_resp = mock.MagicMock()
-            legacy_resp.json.return_value = {'metadata': {'code': '200'}}
+            legacy_resp.content = json.dumps({'metadata': {'code': '200'}}).encode()
             sess.post.return_value = legacy_resp
             self.assertTrue(client.upload_records(payload))
             # Test failure
             bad_resp = mock.MagicMock()
-            bad_resp.json.return_value = {'isSuccess': False, 'status': 'Error'}
+            bad_resp.content = json.dumps({'isSuccess': False, 'status': 'Error'}).encode()
             sess.post.return_value = bad_resp
             self.assertFalse(client.upload_records(payload))
-        with mock.patch.object(client, '_session') as ms:
-            sess = mock.MagicMock()
-            ms.return_value = sess
+        with mock.patch.object(client, 'http') as sess:
             sess.post.side_effect = Exception('net')
             self.assertFalse(client.upload_records(payload))
         client.record_url = None
         self.assertFalse(client.upload_records(payload))
 
+    def test_upload_records_gzip_when_enabled(self):
+        import gzip
+        client = self.api.ApiClient()
+        client.record_url = 'https://example/rec'
+        payload = [{"rfidTag": "019817e3-daa8-76e0-a844-c639ed12ac32", "latitude": 33.0, "longitude": -96.6}] * 50
+        with mock.patch.object(client, 'http') as sess, \
+             mock.patch.object(client, '_headers', return_value={'Content-Type': 'application/json'}):
+            sess.post.return_value.content = json.dumps({'isSuccess': True, 'status': 'Ok'}).encode()
+            # Off by default: body goes out as plain JSON
+            self.assertTrue(client.upload_records(payload))
+            kwargs = sess.post.call_args.kwargs
+            self.assertNotIn('Content-Encoding', kwargs['headers'])
+            self.assertEqual(json.loads(kwargs['data']), payload)
+            client.gzip_upload = True
+            self.assertTrue(client.upload_records(payload))
+            kwargs = sess.post.call_args.kwargs
+            self.assertEqual(kwargs['headers']['Content-Encoding'], 'gzip')
+            self.assertEqual(kwargs['headers']['Content-Type'], 'application/json')
+            self.assertEqual(json.loads(gzip.decompress(kwargs['data'])), payload)
+
+    def test_upload_records_batched_partial_failure(self):
+        client = self.api.ApiClient()
+        client.record_url = 'https://example/rec'
+        payload = [{'tagName': str(i)} for i in range(5)]
+        ids = [10, 11, 12, 13, 14]
+        with mock.patch.object(client, 'http') as sess, \
+             mock.patch.object(client, '_headers', return_value={'Authorization': 'x'}) as mh:
+            ok_resp = mock.MagicMock()
+            ok_resp.content = json.dumps({'isSuccess': True, 'status': 'Ok'}).encode()
+            bad_resp = mock.MagicMock()
+            bad_resp.content = json.dumps({'isSuccess': False, 'status': 'Error'}).encode()
+            # Chunks may complete in any order, so fail the middle one by content
+            sess.post.side_effect = lambda url, data, **kw: bad_resp if json.loads(data) == payload[2:4] else ok_resp
+            uploaded = client.upload_records_batched(payload, ids, batch_size=2)
+            self.assertEqual(sorted(uploaded), [10, 11, 14])
+            self.assertEqual(sess.post.call_count, 3)
+            mh.assert_called_once()
+        self.assertEqual(client.upload_records_batched([], []), [])
+        client.record_url = None
+        self.assertEqual(client.upload_records_batched(payload, ids), [])
+
     def test_decrypt_config_value(self):
         client = self.api.ApiClient()
         # Test non-encrypted value
@@ -162,6 +214,18 @@ class TestApiClient(unittest.TestCase):
         result = client._decrypt_config_value("enc:invalid_base64")
         self.assertEqual(result, "enc:invalid_base64")  # Should return as-is on error
 
+        # Round trip against a reference encoder (longer than 256 bytes to cover the i % 256 wrap)
+        def encrypt(plain):
+            state = 0xA3C59AC3
+            out = bytearray()
+            for i, b in enumerate(plain.encode("utf-8")):
+                state = (1664525 * state + 1013904223) % 2 ** 32
+                out.append(((b ^ ((state >> 24) & 0xFF)) + i) % 256)
+            return "enc:" + base64.urlsafe_b64encode(bytes(out)).decode("utf-8")
+
+        plain = "client-secret-0123456789" * 20
+        self.assertEqual(client._decrypt_config_value(encrypt(plain)), plain)
+
     def test_headers_with_token_expiration(self):
         client = self.api.ApiClient()
         client.token = 'test_token'
@@ -185,6 +249,26 @@ class TestApiClient(unittest.TestCase):
             # The token is not cleared on refresh failure, so Authorization header should still be present
             self.assertEqual(headers['Authorization'], 'Bearer test_token')
 
+    def test_headers_cached_until_expiry(self):
+        client = self.api.ApiClient()
+        client.token = None
+
+        def fake_refresh():
+            client.token = 'fresh'
+            client.token_expires_at = time.time() + 3600
+            return True
+
+        with mock.patch.object(client, 'refresh_token', side_effect=fake_refresh) as mock_refresh:
+            first = client._headers()
+            second = client._headers()
+            self.assertIs(first, second)
+            self.assertEqual(first['Authorization'], 'Bearer fresh')
+            mock_refresh.assert_called_once()
+            # Expiry invalidates the cached headers
+            client.token_expires_at = time.time() - 1
+            client._headers()
+            self.assertEqual(mock_refresh.call_count, 2)
+
     def test_headers_without_token(self):
         client = self.api.ApiClient()
         client.token = None
@@ -196,6 +280,43 @@ class TestApiClient(unittest.TestCase):
             self.assertNotIn('Authorization', headers)
             mock_refresh.assert_called_once()
 
+    def test_auth_failure_backoff_skips_uploads(self):
+        client = self.api.ApiClient()
+        client.token = None
+        client.auth0_url = 'https://example/token'
+        client.health_url = 'https://example/health'
+        client.record_url = 'https://example/rec'
+        with mock.patch.object(client, 'refresh_token', return_value=False) as mock_refresh, \
+             mock.patch.object(client, 'http') as sess:
+            client._headers()
+            mock_refresh.assert_called_once()
+            # Within the backoff window nothing is attempted
+            self.assertFalse(client.upload_health(True, 'Connected', 1.0, 2.0))
+            self.assertFalse(client.upload_records([{'rfidTag': 'x'}]))
+            self.assertEqual(client.upload_records_batched([{'rfidTag': 'x'}], [1]), [])
+            client._headers()
+            mock_refresh.assert_called_once()
+            sess.post.assert_not_called()
+            # Once the window has passed the refresh is retried
+            client._last_auth_failure_at -= self.api._AUTH_RETRY_BACKOFF_S
+            client._headers()
+            self.assertEqual(mock_refresh.call_count, 2)
+
+
+    def test_auth_failure_backoff_applies_with_stale_token(self):
+        client = self.api.ApiClient()
+        client.token = 'stale'
+        client.token_expires_at = time.time() - 10
+        client.auth0_url = 'https://example/token'
+        client.record_url = 'https://example/rec'
+        with mock.patch.object(client, 'refresh_token', return_value=False) as mock_refresh, \
+             mock.patch.object(client, 'http') as sess:
+            client._headers()
+            mock_refresh.assert_called_once()
+            self.assertFalse(client.upload_records([{'rfidTag': 'x'}]))
+            client._headers()
+            mock_refresh.assert_called_once()
+            sess.post.assert_not_called()
 
 if __name__ == '__main__':
     unittest.main()
@@ -10,6 +10,8 @@ class TestCommon(unittest.TestCase):
     def setUp(self):
         from utils import common as c
         self.c = c
+        c._processor_id = None
+        c.get_mac_address.cache_clear()
 
     def test_convert_to_decimal(self):
         self.assertAlmostEqual(self.c.convert_to_decimal('3745.1234', 'N', True), 37.7520567, places=5)
@@ -35,6 +37,19 @@ class TestCommon(unittest.TestCase):
         self.assertTrue(self.c.is_ipv4_address('192.168.0.1'))
         self.assertFalse(self.c.is_ipv4_address('999.168.0.1'))
 
+    def test_dns_probe(self):
+        with mock.patch('utils.common.socket.socket') as msock:
+            sock = msock.return_value.__enter__.return_value
+            sock.recv.return_value = self.c._DNS_PROBE_QUERY[:2] + b'\x81\x80'
+            self.assertIsNotNone(self.c.dns_probe('8.8.8.8', timeout=1))
+            sock.connect.assert_called_once_with(('8.8.8.8', 53))
+            sock.settimeout.assert_called_once_with(1)
+            # Reply to some other query
+            sock.recv.return_value = b'\x00\x00\x81\x80'
+            self.assertIsNone(self.c.dns_probe('8.8.8.8'))
+            sock.recv.side_effect = TimeoutError()
+            self.assertIsNone(self.c.dns_probe('8.8.8.8'))
+
     def test_get_mac_address(self):
         with mock.patch('utils.common.uuid.getnode', return_value=0x123456789ABCDEF0):
             mac = self.c.get_mac_address()
@@ -58,7 +73,27 @@ class TestCommon(unittest.TestCase):
             mser.tools.list_ports.comports.return_value = fake_ports
             self.assertEqual(self.c.pre_config_gps(), 115200)
             ser.write.assert_called()
-            mt.sleep.assert_called()
+            mt.sleep.assert_not_called()
+
+    def test_pre_config_gps_returns_on_first_port_that_takes_command(self):
+        import threading
+        release = threading.Event()
+        def send(port, try_rate, command, wait_time):
+            if port == '/dev/ttyUSB1':
+                return True
+            release.wait(5)  # Silent ports hold out for their full response wait
+            return False
+        fake_ports = [mock.MagicMock(device=d) for d in ('/dev/ttyUSB0', '/dev/ttyUSB1', '/dev/ttyUSB2')]
+        try:
+            with mock.patch('platform.system', return_value='Linux'), \
+                 mock.patch.object(self.c.serial.tools.list_ports, 'comports', return_value=fake_ports), \
+                 mock.patch.object(self.c.settings, 'GPS_CONFIG', {'probe_baud_rate': 115200}), \
+                 mock.patch.object(self.c, '_send_gps_enable', side_effect=send):
+                self.assertEqual(self.c.pre_config_gps(), 115200)
+                # Returned without waiting for the silent ports
+                self.assertFalse(release.is_set())
+        finally:
+            release.set()
 
     def test_find_gps_port(self):
         fake_ports = [mock.MagicMock(device='/dev/ttyUSB0')]
@@ -73,7 +108,7 @@ class TestCommon(unittest.TestCase):
             mser.tools.list_ports.comports.return_value = fake_ports
             port = self.c.find_gps_port(4800)
             self.assertEqual(port, '/dev/ttyUSB0')
-            mt.sleep.assert_called()
+            mt.sleep.assert_not_called()
 
         with mock.patch.object(self.c, 'serial') as mser:
             ctx = mock.MagicMock()
@@ -86,6 +121,22 @@ class TestCommon(unittest.TestCase):
             port = self.c.find_gps_port(4800)
             self.assertIsNone(port)
 
+    def test_read_at_response_stops_at_final_result(self):
+        ser = mock.MagicMock()
+        ser.read_until.side_effect = [b"AT+QGPS=1\r\n", b"\r\n", b"OK\r\n", b"+QGPS: extra\r\n"]
+        self.assertEqual(self.c._read_at_response(ser, 5.0), ['AT+QGPS=1', 'OK'])
+        self.assertEqual(ser.read_until.call_count, 3)
+        self.assertEqual(ser.timeout, self.c._AT_READ_TIMEOUT_S)
+
+        # A line split across reads is joined; an idle port runs until the deadline
+        ser = mock.MagicMock()
+        ser.read_until.side_effect = [b"+CME ", b"", b"ERROR: 505\r\n"]
+        self.assertEqual(self.c._read_at_response(ser, 5.0), ['+CME ERROR: 505'])
+
+        ser = mock.MagicMock()
+        ser.read_until.return_value = b""
+        self.assertEqual(self.c._read_at_response(ser, 0.05), [])
+
     def test_get_processor_id_windows(self):
         """Test get_processor_id on Windows"""
         with mock.patch('platform.system', return_value='Windows'), \
@@ -101,6 +152,26 @@ class TestCommon(unittest.TestCase):
             mock_run.assert_called_once_with(['wmic', 'cpu', 'get', 'ProcessorId'], 
                                            capture_output=True, text=True, timeout=10)
 
+    def test_get_processor_id_cached(self):
+        with mock.patch('platform.system', return_value='Windows'), \
+             mock.patch('subprocess.run') as mock_run:
+            mock_run.return_value.returncode = 0
+            mock_run.return_value.stdout = "ProcessorId\r\nBFEBFBFF00090672\r\n"
+            self.assertEqual(self.c.get_processor_id(), "BFEBFBFF00090672")
+            self.assertEqual(self.c.get_processor_id(), "BFEBFBFF00090672")
+            mock_run.assert_called_once()
+
+    def test_get_processor_id_retries_after_fallback(self):
+        with mock.patch('platform.system', return_value='Windows'), \
+             mock.patch('subprocess.run') as mock_run, \
+             mock.patch.object(self.c, 'get_mac_address', return_value='AA:BB:CC:DD:EE:FF'):
+            mock_run.return_value.returncode = 1
+            self.assertEqual(self.c.get_processor_id(), 'AA:BB:CC:DD:EE:FF')
+            mock_run.return_value.returncode = 0
+            mock_run.return_value.stdout = "ProcessorId\r\nBFEBFBFF00090672\r\n"
+            self.assertEqual(self.c.get_processor_id(), "BFEBFBFF00090672")
+            self.assertEqual(mock_run.call_count, 2)
+
     def test_get_processor_id_windows_fallback(self):
         """Test get_processor_id fallback to MAC address on Windows when wmic fails"""
         with mock.patch('platform.system', return_value='Windows'), \
@@ -144,23 +215,6 @@ class TestCommon(unittest.TestCase):
             self.assertEqual(processor_id, 'AA:BB:CC:DD:EE:FF')
             mock_mac.assert_called_once()
 
-    def test_find_smallest_available_id(self):
-        """Test find_smallest_available_id function"""
-        # Test with consecutive IDs starting from 1
-        used_ids = [(1,), (2,), (3,), (4,)]
-        result = self.c.find_smallest_available_id(used_ids)
-        self.assertEqual(result, 5)
-        
-        # Test with gap in IDs
-        used_ids = [(1,), (2,), (4,), (5,)]
-        result = self.c.find_smallest_available_id(used_ids)
-        self.assertEqual(result, 3)
-        
-        # Test with empty list
-        used_ids = []
-        result = self.c.find_smallest_available_id(used_ids)
-        self.assertEqual(result, 1)
-
 
 if __name__ == '__main__':
     unittest.main()
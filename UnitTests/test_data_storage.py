@@ -23,18 +23,53 @@ class TestDataStorage(unittest.TestCase):
         s.use_db = True
         s.db_connection = mock.MagicMock()
         s.db_cursor = mock.MagicMock()
-        rec = [1, 'TAG', 1, -50, 1.0, 2.0, 3.0, 90.0, 'L', 'U', 123, None, None, None, None, None, None, None, None]
+        rec = ['TAG', 1, -50, 1.0, 2.0, 3.0, 90.0, 'L', 'U', 123, None, None, None, None, None, None, None, None]
         s.add_record(rec)
         args = s.db_cursor.execute.call_args[0]
         sanitized = args[1]
         self.assertNotIn(None, sanitized)
+        # Commit is deferred until the batch fills up or the interval passes
+        s.db_connection.commit.assert_not_called()
+        s.flush()
         s.db_connection.commit.assert_called_once()
 
+    def test_add_record_batched_commit_and_prune_sqlite(self):
+        with mock.patch('utils.data_storage.DATABASE_FILE', ':memory:'):
+            s = self.ds.DataStorage(use_db=True, max_records=100)
+        commit_spy = mock.MagicMock(wraps=s.db_connection.commit)
+        s.db_connection = mock.MagicMock(wraps=s.db_connection, commit=commit_spy)
+        with mock.patch('utils.data_storage.time.time', return_value=s._last_commit):
+            for i in range(1, 151):
+                s.add_record([f'TAG{i}', 1, -50, 1.0, 2.0, 3.0, 90.0, 'L', 'U', i,
+                              '', '', '', '', '', '', '', ''])
+        # One commit for the first full batch, the rest still pending
+        self.assertEqual(commit_spy.call_count, 1)
+        self.assertEqual(s._pending_inserts, 50)
+        rows = s.fetch_all_records()
+        self.assertEqual(commit_spy.call_count, 2)
+        self.assertEqual(len(rows), 100)
+        self.assertEqual(rows[0][0], 51)
+        self.assertEqual(rows[0][1], 'TAG51')
+        s.close()
+
     def test_add_record_memory(self):
         s = self.ds.DataStorage(use_db=False)
-        rec = [1, 'TAG', 1, -50, 1.0, 2.0, 3.0, 90.0, 'L', 'U', 123, '', '', '', '', '', '', '', '']
-        s.add_record(rec)
-        self.assertEqual(len(s.database), 1)
+        rec = ['TAG', 1, -50, 1.0, 2.0, 3.0, 90.0, 'L', 'U', 123, '', '', '', '', '', '', '', '']
+        self.assertEqual(s.add_record(rec), 1)
+        self.assertEqual(s.add_record(rec), 2)
+        self.assertEqual(list(s.database[0]), [1, *rec])
+
+    def test_memory_storage_bounded_and_delete(self):
+        s = self.ds.DataStorage(use_db=False, max_records=3)
+        for i in range(1, 6):
+            s.add_record([f'TAG{i}'])
+        self.assertEqual([r[0] for r in s.fetch_all_records()], [3, 4, 5])
+        s.delete_uploaded_records([3, 5])
+        self.assertEqual([r[0] for r in s.fetch_all_records()], [4])
+        s.add_record(['TAG6'])
+        s.add_record(['TAG7'])
+        s.add_record(['TAG8'])
+        self.assertEqual([r[0] for r in s.fetch_all_records()], [6, 7, 8])
 
     def test_fetch_all_records_db_and_memory(self):
         s = self.ds.DataStorage(use_db=False)
@@ -56,18 +91,13 @@ class TestDataStorage(unittest.TestCase):
             s.db_cursor.execute.assert_called()
             s.db_connection.commit.assert_called()
 
-        s.use_db = False
-        with mock.patch('utils.data_storage.time.time', return_value=1000):
-            current = int(1000 * 1_000_000)
-            old = current - 700_000_000
-            recent = current - 100_000_000
-            s.database = [
-                [1, 'TAG', 1, -50, 0, 0, 0, 0, '', '', old, '', '', '', '', '', '', '', ''],
-                [2, 'TAG2', 1, -50, 0, 0, 0, 0, '', '', recent, '', '', '', '', '', '', '', '']
-            ]
-            s.prune_old()
-            self.assertEqual(len(s.database), 1)
-
+        # In memory the deque bounds itself; prune_old leaves it untouched
+        s = self.ds.DataStorage(use_db=False, max_records=2)
+        for tag in ('TAG1', 'TAG2', 'TAG3'):
+            s.add_record([tag, 1, -50, 0, 0, 0, 0, '', '', 0, '', '', '', '', '', '', '', ''])
+        self.assertEqual([rec[1] for rec in s.database], ['TAG2', 'TAG3'])
+        s.prune_old()
+        self.assertEqual([rec[:2] for rec in s.database], [[2, 'TAG2'], [3, 'TAG3']])
 
 if __name__ == '__main__':
     unittest.main()
@@ -15,8 +15,9 @@ class TestGPS(unittest.TestCase):
         self.assertEqual(gps.baud_rate, 115200)
         self.assertFalse(gps.connectivity)
         self.assertIsNone(gps._ser)
-        self.assertEqual(gps._data, {})
-        self.assertEqual(gps._sdata, [0, 0])
+        self.assertIsNone(gps._rmc)
+        self.assertEqual(gps.get_data(), {})
+        self.assertEqual(gps._sdata, (0, 0))
 
     def test_connect_success(self):
         gps = self.gps_module.GPS(port=self.PORT, baud_rate=115200)
@@ -40,16 +41,20 @@ class TestGPS(unittest.TestCase):
         gps._ser.in_waiting = 100
         with mock.patch('utils.gps.pynmea2.parse') as mock_parse:
             mock_msg = mock.MagicMock()
-            mock_msg.fields = [("Latitude", "lat"), ("Longitude", "lon"), ("Speed", "spd_over_grnd"), ("Course", "true_course")]
             mock_msg.lat = "3342.1234"
+            mock_msg.lat_dir = "N"
             mock_msg.lon = "96884.5678"
             mock_msg.spd_over_grnd = 5.5
             mock_msg.true_course = 45.0
             mock_parse.return_value = mock_msg
-            gps._ser.readline.return_value = b"$GPRMC,123456.00,A,3342.1234,N,96884.5678,W,5.5,45.0,200920,1.2,E,A*12\r\n"
+            gps._ser.read.return_value = b"$GPRMC,123456.00,A,3342.1234,N,96884.5678,W,5.5,45.0,200920,1.2,E,A*12\r\n"
             gps.read_serial_data()
-            self.assertEqual(gps._data["lat"], "3342.1234")
-            self.assertEqual(gps._data["lon"], "96884.5678")
+            data = gps.get_data()
+            self.assertEqual(data["lat"], "3342.1234")
+            self.assertEqual(data["lon"], "96884.5678")
+            self.assertEqual(data["lat_dir"], "N")
+            # Built once per sentence
+            self.assertIs(gps.get_data(), data)
             self.assertAlmostEqual(gps._sdata[0], 6.33, places=2)  # 5.5 knots * 1.15078 = 6.33 mph
             self.assertEqual(gps._sdata[1], 45.0)
 
@@ -58,18 +63,41 @@ class TestGPS(unittest.TestCase):
         gps._ser = mock.MagicMock()
         gps._ser.in_waiting = 100
         with mock.patch('utils.gps.pynmea2.parse', side_effect=self.gps_module.pynmea2.ParseError("Invalid", "INVALID")):
-            gps._ser.readline.return_value = b"INVALID_SENTENCE\r\n"
+            gps._ser.read.return_value = b"$GPRMC,INVALID_SENTENCE\r\n"
             gps.read_serial_data()
-            self.assertEqual(gps._data, {})
-            self.assertEqual(gps._sdata, [0, 0])
+            self.assertIsNone(gps._rmc)
+            self.assertEqual(gps.get_data(), {})
+            self.assertEqual(gps._sdata, (0, 0))
+
+    def test_read_serial_data_buffers_partial_sentences(self):
+        gps = self.gps_module.GPS(port=self.PORT, baud_rate=115200)
+        gps._ser = mock.MagicMock()
+        gps._ser.in_waiting = 10
+        with mock.patch.object(gps, '_handle_rmc') as mock_handle:
+            # Non-RMC sentences are skipped, a trailing partial one is kept
+            gps._ser.read.return_value = b"$GPGGA,1*00\r\n$GNRMC,1*00\r\n$GPRMC,12"
+            gps.read_serial_data()
+            mock_handle.assert_called_once_with("$GNRMC,1*00")
+            gps._ser.read.return_value = b"3*00\r\n"
+            gps.read_serial_data()
+            mock_handle.assert_called_with("$GPRMC,123*00")
+            self.assertEqual(gps._rxbuf, bytearray())
+            # Empty port: one blocking single-byte read, nothing handled
+            gps._ser.in_waiting = 0
+            gps._ser.read.return_value = b""
+            gps.read_serial_data()
+            gps._ser.read.assert_called_with(1)
+            self.assertEqual(mock_handle.call_count, 2)
 
     def test_run_connect_loop(self):
         gps = self.gps_module.GPS(port=self.PORT, baud_rate=115200)
         with mock.patch.object(gps, '_connect', side_effect=[None, mock.MagicMock()]) as mock_connect, \
              mock.patch.object(gps._b_stop, 'is_set', side_effect=[False, False, True]), \
-             mock.patch.object(gps._b_stop, 'wait'):
+             mock.patch.object(gps._b_stop, 'wait') as mock_wait:
             gps.run()
             self.assertEqual(mock_connect.call_count, 2)
+            # Failed connects back off on the stop event instead of spinning
+            mock_wait.assert_called_once_with(self.gps_module._RECONNECT_INTERVAL_S)
 
     def test_run_connection_monitoring(self):
         gps = self.gps_module.GPS(port=self.PORT, baud_rate=115200)
@@ -77,7 +105,7 @@ class TestGPS(unittest.TestCase):
         gps.connectivity = True
         def raise_and_stop():
             gps._b_stop.set()
-            raise Exception("Connection lost")
+            raise self.gps_module.serial.SerialException("Connection lost")
         with mock.patch.object(gps, 'read_serial_data', side_effect=raise_and_stop), \
              mock.patch('utils.gps.time.sleep', return_value=None):
             import threading
@@ -101,6 +129,24 @@ class TestGPS(unittest.TestCase):
             mock_wait.assert_called_once_with(1)
             self.assertIsNone(gps._ser)
 
+    def test_stop_leaves_port_to_running_thread(self):
+        gps = self.gps_module.GPS(port=self.PORT, baud_rate=115200)
+        ser = gps._ser = mock.MagicMock()
+        with mock.patch.object(gps, 'wait', return_value=False):
+            gps.stop()
+        self.assertIs(gps._ser, ser)
+        ser.close.assert_not_called()
+
+    def test_run_closes_port_on_exit(self):
+        gps = self.gps_module.GPS(port=self.PORT, baud_rate=115200)
+        ser = mock.MagicMock()
+        ser.is_open = True
+        with mock.patch.object(gps, '_connect', return_value=ser), \
+             mock.patch.object(gps, 'read_serial_data', side_effect=gps._b_stop.set):
+            gps.run()
+        ser.close.assert_called_once()
+        self.assertIsNone(gps._ser)
+
     def test_close_serial(self):
         gps = self.gps_module.GPS(port=self.PORT, baud_rate=115200)
         mock_ser = mock.MagicMock()
@@ -124,10 +170,11 @@ class TestGPS(unittest.TestCase):
         self.assertTrue(gps.is_alive())
         gps._b_stop.set()
         self.assertFalse(gps.is_alive())
-        gps._data = {"lat": "1", "lon": "2"}
-        gps._sdata = [1.2, 34.0]
-        self.assertEqual(gps.get_data(), {"lat": "1", "lon": "2"})
-        self.assertEqual(gps.get_sdata(), [1.2, 34.0])
+        gps._rmc = mock.MagicMock(lat="1", lon="2")
+        gps._sdata = (1.2, 34.0)
+        data = gps.get_data()
+        self.assertEqual((data["lat"], data["lon"]), ("1", "2"))
+        self.assertEqual(gps.get_sdata(), (1.2, 34.0))
 
 
 if __name__ == "__main__":
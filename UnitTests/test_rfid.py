@@ -13,10 +13,25 @@ class TestRFID(unittest.TestCase):
         self.assertEqual(args['antennas'], '1')
         self.assertEqual(args['port'], self.r.LLRP_DEFAULT_PORT)
 
-    def test_convert_to_unicode(self):
-        self.assertEqual(self.r._convert_to_unicode(b'abc'), 'abc')
-        self.assertEqual(self.r._convert_to_unicode({'k': b'v'})['k'], 'v')
-        self.assertEqual(self.r._convert_to_unicode([b'a', 'b'])[0], 'a')
+    def test_decode_tag_inplace(self):
+        tag = {'EPC-96': b'abc', 'AntennaID': 1, 'OpSpecResult': {'ReadData': b'v'}, 'L': [b'a', 'b']}
+        out = self.r._decode_tag_inplace(tag)
+        self.assertIs(out, tag)
+        self.assertEqual(tag['EPC-96'], 'abc')
+        self.assertEqual(tag['AntennaID'], 1)
+        self.assertEqual(tag['OpSpecResult']['ReadData'], 'v')
+        self.assertEqual(tag['L'], ['a', 'b'])
+
+    def test_parse_antennas(self):
+        self.assertEqual(self.r._parse_antennas('1, 2,4'), (1, 2, 4))
+        self.assertIs(self.r._parse_antennas('1, 2,4'), self.r._parse_antennas('1, 2,4'))
+
+    def test_get_cfg_cached_until_reload(self):
+        with mock.patch('utils.rfid.config_version', return_value=100):
+            first = self.r._get_cfg()
+            self.assertIs(self.r._get_cfg(), first)
+        with mock.patch('utils.rfid.config_version', return_value=101):
+            self.assertIsNot(self.r._get_cfg(), first)
 
     def test_init_sets_reader(self):
         with mock.patch('utils.rfid.LLRPReaderClient') as mclient, \
@@ -35,11 +50,39 @@ class TestRFID(unittest.TestCase):
             self.assertTrue(rf.connectivity)
             mclient.assert_called()
 
+    def test_set_reader_factory_args(self):
+        with mock.patch('utils.rfid.LLRPReaderClient'), \
+             mock.patch('utils.rfid.LLRPReaderConfig') as mconfig:
+            rf = self.r.RFID()
+            rf._set_reader('1.2.3.4', False)
+            factory_args = mconfig.call_args[0][0]
+            self.assertTrue(factory_args['start_inventory'])
+            self.assertIs(factory_args['tag_content_selector'], self.r._TAG_CONTENT_SELECTOR)
+            self.assertTrue(factory_args['tag_content_selector']['C1G2EPCMemorySelector']['EnableCRC'])
+            self.assertIn('report_every_n_tags', factory_args)
+
     def test_tag_seen_callback_updates_state(self):
         rf = self.r.RFID()
         rf.tag_seen_callback(None, [{'EPC-96': '123'}])
         self.assertEqual(rf.tag_data[0]['EPC-96'], '123')
 
+    def test_tag_seen_callback_decodes_first_tag_only(self):
+        rf = self.r.RFID()
+        tags = [{'EPC-96': b'111'}, {'EPC-96': b'222'}]
+        rf.tag_seen_callback(None, tags)
+        self.assertEqual(rf.tag_data[0]['EPC-96'], '111')
+        self.assertEqual(tags[1]['EPC-96'], b'222')
+
+    def test_tag_signal_coalesced_until_taken(self):
+        rf = self.r.RFID()
+        with mock.patch.object(rf, 'sig_msg') as sig:
+            rf.tag_seen_callback(None, [{'EPC-96': '1'}])
+            rf.tag_seen_callback(None, [{'EPC-96': '2'}])
+            sig.emit.assert_called_once_with(3)
+            self.assertEqual(rf.take_tag_data()[0]['EPC-96'], '2')
+            rf.tag_seen_callback(None, [{'EPC-96': '3'}])
+            self.assertEqual(sig.emit.call_count, 2)
+
     def test_run_connect_flow(self):
         with mock.patch('utils.rfid.LLRPReaderClient') as mclient, \
              mock.patch('utils.rfid.LLRPReaderConfig'):
@@ -51,26 +94,109 @@ class TestRFID(unittest.TestCase):
                 # reader.connect should have been called twice total (failure then success)
                 self.assertEqual(rf.reader.connect.call_count, 2)
 
+    def test_run_waits_on_stop_event(self):
+        with mock.patch('utils.rfid.LLRPReaderClient'), \
+             mock.patch('utils.rfid.LLRPReaderConfig'):
+            rf = self.r.RFID()
+            rf.reader = mock.MagicMock()
+            rf.reader.connect.side_effect = Exception('x')
+            with mock.patch.object(rf._b_stop, 'is_set', side_effect=[False, True, True, True]), \
+                 mock.patch.object(rf._b_stop, 'wait', return_value=True) as w:
+                rf.run()
+                w.assert_called_once_with(.1)
+
     def test_run_ping_monitoring(self):
         with mock.patch('utils.rfid.LLRPReaderClient') as mclient, \
              mock.patch('utils.rfid.LLRPReaderConfig'), \
-             mock.patch('utils.rfid.ping', return_value=None):
+             mock.patch('utils.rfid._probe_host', return_value=False):
             rf = self.r.RFID()
             rf.reader = mock.MagicMock()
+            rf.reader.is_alive.return_value = False
             rf.connectivity = True
             # First False consumed by connect loop, second False allows one main-loop iteration, then stop
             with mock.patch.object(rf._b_stop, 'is_set', side_effect=[False, False, True]):
                 rf.run()
-                # connectivity should be marked False when ping fails
+                # connectivity should be marked False when the LLRP session dies
                 self.assertFalse(rf.connectivity)
 
+    def test_probe_host_open_and_closed_port(self):
+        import socket
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as srv:
+            srv.bind(('127.0.0.1', 0))
+            srv.listen(1)
+            port = srv.getsockname()[1]
+            self.assertTrue(self.r._probe_host('127.0.0.1', port))
+        self.assertFalse(self.r._probe_host('127.0.0.1', port))
+
+    def test_probe_hosts_batch_returns_open_host(self):
+        import socket
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as srv:
+            srv.bind(('127.0.0.1', 0))
+            srv.listen(1)
+            port = srv.getsockname()[1]
+            self.assertEqual(self.r._probe_hosts_batch(['127.0.0.2', '127.0.0.1'], port), '127.0.0.1')
+        self.assertIsNone(self.r._probe_hosts_batch(['127.0.0.1'], port))
+        self.assertIsNone(self.r._probe_hosts_batch([], port))
+
+    def test_host_reachable_is_cached(self):
+        rf = self.r.RFID()
+        with mock.patch('utils.rfid._probe_host', return_value=True) as probe:
+            self.assertTrue(rf._host_reachable())
+            self.assertTrue(rf._host_reachable())
+            probe.assert_called_once_with(rf.host, rf._cfg['port'])
+
+    def test_host_reachable_uses_llrp_idle_deadline(self):
+        rf = self.r.RFID()
+        rf.reader = mock.MagicMock()
+        rf.reader.is_alive.return_value = True
+        rf.connectivity = True
+        with mock.patch('utils.rfid._probe_host') as probe:
+            rf._on_keepalive(rf.reader, None)
+            self.assertTrue(rf._host_reachable())
+            # Socket thread still alive but the reader went silent (cable pulled)
+            rf._last_rx -= self.r._LLRP_IDLE_TIMEOUT_S + 1
+            self.assertFalse(rf._host_reachable())
+            rf._last_rx += self.r._LLRP_IDLE_TIMEOUT_S + 1
+            rf.reader.is_alive.return_value = False
+            self.assertFalse(rf._host_reachable())
+            probe.assert_not_called()
+
+    def test_set_reader_requests_keepalives(self):
+        with mock.patch('utils.rfid.LLRPReaderClient'), \
+             mock.patch('utils.rfid.LLRPReaderConfig') as mconfig:
+            rf = self.r.RFID()
+            self.assertEqual(mconfig.call_args[0][0]['keepalive_interval'], self.r._LLRP_KEEPALIVE_MS)
+            rf.reader.add_message_callback.assert_called_with('KEEPALIVE', rf._on_keepalive)
+
     def test_stop_disconnects(self):
         with mock.patch('utils.rfid.LLRPReaderClient.disconnect_all_readers') as disc:
             rf = self.r.RFID()
+            reader = rf.reader = mock.MagicMock()
             with mock.patch.object(rf, 'wait') as w:
                 rf.stop()
                 w.assert_called()
-                disc.assert_called()
+                reader.disconnect.assert_called_once_with(timeout=1)
+                disc.assert_not_called()
+                self.assertIsNone(rf.reader)
+
+    def test_stop_kills_running_arp_scan(self):
+        rf = self.r.RFID()
+        rf._scan_proc = mock.MagicMock()
+        with mock.patch.object(rf, 'wait'), \
+             mock.patch('utils.rfid.stop_arp_scan') as stop_scan:
+            rf.stop()
+            stop_scan.assert_called_once_with(rf._scan_proc)
+
+    def test_release_reader_sweeps_orphaned_readers(self):
+        with mock.patch('utils.rfid.LLRPReaderClient') as mclient, \
+             mock.patch('utils.rfid.LLRPReaderConfig'):
+            rf = self.r.RFID()
+            old = rf.reader
+            rf.set_reader('1.2.3.4', False)
+            rf._release_reader()
+            mclient.disconnect_all_readers.assert_called_once()
+            old.disconnect.assert_not_called()
+            self.assertFalse(rf._reader_orphaned)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,122 @@
+import unittest
+from unittest import mock
+
+
+SAMPLE_OUTPUT = (
+    b"169.254.10.2\t00:16:25:aa:bb:cc\tImpinj, Inc.\n"
+    b"169.254.10.3\t84:24:8D:00:11:22\tZebra Technologies Inc\n"
+    b"169.254.10.4\tde:ad:be:ef:00:01\t\n"
+)
+
+
+class TestRFIDDiscovery(unittest.TestCase):
+    def setUp(self):
+        from utils import rfid_discovery as d
+        self.d = d
+
+    def test_parse_first_rfid(self):
+        lines = SAMPLE_OUTPUT.splitlines(keepends=True)
+        self.assertEqual(self.d.parse_first_rfid(lines), ('169.254.10.2', 'Impinj, Inc.'))
+        self.assertEqual(self.d.parse_first_rfid(lines, (b"zebra",)), ('169.254.10.3', 'Zebra Technologies Inc'))
+        self.assertIsNone(self.d.parse_first_rfid([b"169.254.10.4\tde:ad:be:ef:00:01\tAcme\n"]))
+
+    def test_run_arp_scan_streams_and_terminates_on_close(self):
+        proc = mock.MagicMock()
+        proc.pid = 4321
+        proc.stdout.__iter__.return_value = iter(SAMPLE_OUTPUT.splitlines(keepends=True))
+        proc.poll.return_value = None
+        on_start = mock.MagicMock()
+        with mock.patch('utils.rfid_discovery.subprocess.Popen', return_value=proc) as popen, \
+             mock.patch('utils.rfid_discovery.os.killpg', create=True) as killpg:
+            gen = self.d.run_arp_scan('eth0', '169.254.0.0/16', use_sudo=False, on_start=on_start)
+            self.assertTrue(next(gen).startswith(b"169.254.10.2"))
+            gen.close()
+        self.assertTrue(popen.call_args.kwargs['start_new_session'])
+        on_start.assert_called_once_with(proc)
+        killpg.assert_called_once_with(4321, self.d.signal.SIGTERM)
+        proc.wait.assert_called_once_with(1)
+        proc.stdout.close.assert_called_once()
+
+    def test_stop_arp_scan_kills_group_after_timeout(self):
+        proc = mock.MagicMock()
+        proc.pid = 4321
+        proc.poll.return_value = None
+        proc.wait.side_effect = [self.d.subprocess.TimeoutExpired('arp-scan', 1), 0]
+        with mock.patch('utils.rfid_discovery.os.killpg', create=True) as killpg:
+            self.d.stop_arp_scan(proc)
+        self.assertEqual(killpg.call_args_list,
+                         [mock.call(4321, self.d.signal.SIGTERM), mock.call(4321, self.d.signal.SIGKILL)])
+
+    def test_stop_arp_scan_signals_through_sudo_when_not_permitted(self):
+        proc = mock.MagicMock()
+        proc.pid = 4321
+        proc.poll.return_value = None
+        proc.wait.return_value = 0
+        with mock.patch('utils.rfid_discovery.os.killpg', create=True, side_effect=PermissionError), \
+             mock.patch('utils.rfid_discovery.subprocess.run') as run:
+            run.return_value.returncode = 0
+            self.d.stop_arp_scan(proc)
+        self.assertEqual(run.call_args[0][0], ["sudo", "-n", "kill", "-TERM", "--", "-4321"])
+        proc.wait.assert_called_once_with(1)
+
+    def test_stop_arp_scan_gives_up_when_sudo_not_permitted(self):
+        proc = mock.MagicMock()
+        proc.pid = 4321
+        proc.poll.return_value = None
+        with mock.patch('utils.rfid_discovery.os.killpg', create=True, side_effect=PermissionError), \
+             mock.patch('utils.rfid_discovery.subprocess.run') as run, \
+             mock.patch('utils.rfid_discovery.logger') as log:
+            run.return_value.returncode = 1
+            self.d.stop_arp_scan(proc)
+        run.assert_called_once()
+        proc.wait.assert_not_called()
+        log.warning.assert_called_once()
+
+    def test_stop_arp_scan_ignores_finished_process(self):
+        proc = mock.MagicMock()
+        proc.poll.return_value = 0
+        with mock.patch('utils.rfid_discovery.os.killpg', create=True) as killpg:
+            self.d.stop_arp_scan(proc)
+        killpg.assert_not_called()
+
+    def test_run_arp_scan_uses_plain_output(self):
+        proc = mock.MagicMock()
+        proc.stdout.__iter__.return_value = iter([])
+        proc.wait.return_value = 0
+        with mock.patch('utils.rfid_discovery.subprocess.Popen', return_value=proc) as popen:
+            list(self.d.run_arp_scan('eth0', '169.254.0.0/16', use_sudo=False))
+        cmd = popen.call_args[0][0]
+        self.assertEqual(cmd, ["arp-scan", "--interface", "eth0", "--plain", "--ignoredups", "169.254.0.0/16"])
+        self.assertIs(popen.call_args.kwargs['stderr'], self.d.subprocess.STDOUT)
+
+    def test_run_arp_scan_line_buffered_is_opt_in(self):
+        proc = mock.MagicMock()
+        proc.stdout.__iter__.return_value = iter([])
+        proc.wait.return_value = 0
+        with mock.patch('utils.rfid_discovery.subprocess.Popen', return_value=proc) as popen, \
+             mock.patch('utils.rfid_discovery.shutil.which', return_value='/usr/bin/stdbuf'):
+            list(self.d.run_arp_scan('eth0', '169.254.0.0/16', use_sudo=False, line_buffered=True))
+        self.assertEqual(popen.call_args[0][0][:2], ["stdbuf", "-oL"])
+
+    def test_run_arp_scan_failure_reports_output(self):
+        proc = mock.MagicMock()
+        proc.stdout.__iter__.return_value = iter([b"ioctl: No such device\n"])
+        proc.wait.return_value = 1
+        with mock.patch('utils.rfid_discovery.subprocess.Popen', return_value=proc):
+            with self.assertRaisesRegex(RuntimeError, "No such device"):
+                list(self.d.run_arp_scan('eth0', '169.254.0.0/16', use_sudo=False))
+
+    def test_discover_rfid_readers_returns_first_vendor_match(self):
+        with mock.patch('utils.rfid_discovery.platform.system', return_value='Linux'), \
+             mock.patch('utils.rfid_discovery.check_arp_scan_available', return_value=True), \
+             mock.patch('utils.rfid_discovery.run_arp_scan',
+                        return_value=(line for line in SAMPLE_OUTPUT.splitlines(keepends=True))):
+            self.assertEqual(self.d.discover_rfid_readers(), '169.254.10.2')
+
+    def test_discover_rfid_readers_non_linux(self):
+        with mock.patch('utils.rfid_discovery.platform.system', return_value='Windows'):
+            self.assertIsNone(self.d.discover_rfid_readers())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,20 +1,24 @@
 from PySide6.QtCore import Qt, QTimer, QThread, Signal
-from PySide6.QtWidgets import QTableWidgetItem
+from PySide6.QtWidgets import QSizePolicy, QTableWidgetItem
 
 from screens.base import BaseScreen
 from ui.screens.ui_overview import Ui_OverviewScreen
 from utils.logger import logger
 from utils.rfid import RFID
 from utils.gps import GPS
-from utils.common import extract_from_gps, get_date_from_utc, pre_config_gps, find_gps_port, get_processor_id, enable_gps_at_command
-from utils.data_storage import DataStorage
+from utils.common import extract_from_gps, get_date_from_utc, pre_config_gps, find_gps_port, get_processor_id, enable_gps_at_command, dns_probe
+from utils.data_storage import DataStorage, COMMIT_INTERVAL_S
 from utils.api_client import ApiClient
 import settings
 from settings import API_CONFIG, FILTER_CONFIG, DATABASE_CONFIG, reload_config
 import time
 import subprocess
 import platform
-from ping3 import ping
+
+
+# Status label stylesheets, shared instead of rebuilt on every status update
+_STATUS_OK_QSS = "color: #00ff00;"
+_STATUS_ERR_QSS = "color: #ff0000;"
 
 
 class GPSScannerThread(QThread):
@@ -41,6 +45,14 @@ class GPSScannerThread(QThread):
         self.wait()
 
 
+class InternetCheckThread(QThread):
+    """Background probe of Google DNS so a slow or failed probe never blocks the UI"""
+    checked = Signal(object)  # response time in ms, or None when unreachable
+
+    def run(self):
+        self.checked.emit(dns_probe("8.8.8.8", timeout=3))
+
+
 class OverviewScreen(BaseScreen):
 
     def __init__(self, app, **kwargs):
@@ -65,6 +77,20 @@ class OverviewScreen(BaseScreen):
         self.ui.tableWidget.setColumnWidth(5, 60)   # Speed
         self.ui.tableWidget.setColumnWidth(6, 75)   # Heading
 
+        # Freeze status panel geometry: only label texts change at runtime, so
+        # text updates should not trigger a layout size renegotiation
+        for row in ((self.ui.widget_4, self.ui.widget_5), (self.ui.widget_9, self.ui.widget_12)):
+            row_height = max(w.sizeHint().height() for w in row)
+            for w in row:
+                w.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
+                w.setFixedHeight(row_height)
+        for name in ("device_id", "rfid_connection_status", "last_rfid_read", "last_rfid_time",
+                     "gps_connection_status", "last_gps_read", "last_gps_time",
+                     "truck_number", "site_id", "internet_status"):
+            label = getattr(self.ui, name)
+            label.setSizePolicy(QSizePolicy.Policy.Preferred, QSizePolicy.Policy.Fixed)
+            label.setTextFormat(Qt.TextFormat.PlainText)
+
         # Init helpers and modules
         self.api = ApiClient()
         self.storage = DataStorage(
@@ -113,7 +139,7 @@ class OverviewScreen(BaseScreen):
 
         # RFID init
         # Initialize RFID connection status to "Disconnected" instead of "N/A"
-        self.ui.rfid_connection_status.setStyleSheet("""color: #ff0000;""")
+        self._set_status_color(self.ui.rfid_connection_status, False)
         self.ui.rfid_connection_status.setText("Disconnected")
         
         # Initialize RFID with GPS getter function to always access current GPS instance
@@ -130,12 +156,19 @@ class OverviewScreen(BaseScreen):
         self.upload_timer.timeout.connect(self._upload_records)
         self.upload_timer.start(int(API_CONFIG.get('record_interval_ms', 7000)))
 
+        # Commit batched inserts even when no further record arrives to trigger it
+        self.storage_flush_timer = QTimer(self)
+        self.storage_flush_timer.timeout.connect(self.storage.flush)
+        self.storage_flush_timer.start(int(COMMIT_INTERVAL_S * 1000))
+
         # GPS display update timer
         self.gps_display_timer = QTimer(self)
         self.gps_display_timer.timeout.connect(self._update_gps_display)
         self.gps_display_timer.start(2000)  # Update every 2 seconds
 
-        # Internet status check timer
+        # Internet status check timer; the probe itself runs on a worker thread
+        self.internet_check = InternetCheckThread()
+        self.internet_check.checked.connect(self._on_internet_checked)
         self.internet_timer = QTimer(self)
         self.internet_timer.timeout.connect(self._check_internet_status)
         self.internet_timer.start(5000)  # Check every 5 seconds
@@ -161,18 +194,30 @@ class OverviewScreen(BaseScreen):
             self.gps_display_timer.stop()
         if hasattr(self, 'internet_timer'):
             self.internet_timer.stop()
+        if hasattr(self, 'internet_check'):
+            self.internet_check.wait()
         if hasattr(self, 'gps_timeout_timer'):
             self.gps_timeout_timer.stop()
         if hasattr(self, 'config_reload_timer'):
             self.config_reload_timer.stop()
+        if hasattr(self, 'storage_flush_timer'):
+            self.storage_flush_timer.stop()
         self.storage.close()
+        self.api.close()
+
+    def _set_status_color(self, label, ok):
+        # setStyleSheet repolishes the label even for an identical sheet, so only
+        # apply it when the status color actually changes
+        sheet = _STATUS_OK_QSS if ok else _STATUS_ERR_QSS
+        if label.styleSheet() != sheet:
+            label.setStyleSheet(sheet)
 
     def _set_gps_status(self, text, ok):
-        self.ui.gps_connection_status.setStyleSheet("""color: #00ff00;""" if ok else """color: #ff0000;""")
+        self._set_status_color(self.ui.gps_connection_status, ok)
         self.ui.gps_connection_status.setText(text)
 
     def _set_internet_status(self, text, ok):
-        self.ui.internet_status.setStyleSheet("""color: #00ff00;""" if ok else """color: #ff0000;""")
+        self._set_status_color(self.ui.internet_status, ok)
         self.ui.internet_status.setText(text)
 
     def _on_gps_status(self, status):
@@ -194,23 +239,24 @@ class OverviewScreen(BaseScreen):
     def _on_rfid_status(self, status):
         # logger.debug(f"RFID status received: {status}")
         if status == 1:
-            self.ui.rfid_connection_status.setStyleSheet("""color: #00ff00;""")
+            self._set_status_color(self.ui.rfid_connection_status, True)
             self.ui.rfid_connection_status.setText("Connected")
             logger.info("RFID reader connected")
         elif status == 2:
-            self.ui.rfid_connection_status.setStyleSheet("""color: #ff0000;""")
+            self._set_status_color(self.ui.rfid_connection_status, False)
             self.ui.rfid_connection_status.setText("Disconnected")
             logger.warning("RFID reader disconnected")
         elif status == 3:
             # logger.debug("RFID tag detected, processing...")
-            if not self.rfid.tag_data or len(self.rfid.tag_data) < 5:
+            tag_data = self.rfid.take_tag_data()
+            if not tag_data or len(tag_data) < 5:
                 logger.warning("RFID tag detected but no tag data available")
                 return
-            tag = self.rfid.tag_data[0]
-            lat = self.rfid.tag_data[1]
-            lon = self.rfid.tag_data[2]
-            speed = self.rfid.tag_data[3]
-            bearing = self.rfid.tag_data[4]
+            tag = tag_data[0]
+            lat = tag_data[1]
+            lon = tag_data[2]
+            speed = tag_data[3]
+            bearing = tag_data[4]
             # logger.debug(f"Processing tag: EPC={tag.get('EPC-96', 'N/A')}, Antenna={tag.get('AntennaID', 'N/A')}, RSSI={tag.get('PeakRSSI', 'N/A')}")
             if lat != 0 and lon != 0:
                 self.last_lat = lat
@@ -281,12 +327,9 @@ class OverviewScreen(BaseScreen):
                     ''', (tag['EPC-96'], tag['LastSeenTimestampUTC'], duplicate_window_microseconds, lat, lon))
                     rows = self.storage.db_cursor.fetchall()
                     if not rows:
-                        # Prepare record list with explicit id
-                        assert self.storage.db_cursor
-                        self.storage.db_cursor.execute('SELECT id FROM records ORDER BY id ASC')
-                        used_ids = self.storage.db_cursor.fetchall()
+                        # The id is assigned by the storage on insert
                         rec = [
-                            calculate_next_id(used_ids), tag['EPC-96'], f"{tag['AntennaID']}", f"{tag['PeakRSSI']}",
+                            tag['EPC-96'], f"{tag['AntennaID']}", f"{tag['PeakRSSI']}",
                             lat, lon, speed, bearing, "-", self.api.user_name, tag['LastSeenTimestampUTC'],
                             "", "", "", "", "", "", "", ""
                         ]
@@ -296,7 +339,7 @@ class OverviewScreen(BaseScreen):
                         self.last_stored_lat = current_lat
                         self.last_stored_lon = current_lon
                 else:
-                    new_data = [True, tag['EPC-96'], f"{tag['AntennaID']}", f"{tag['PeakRSSI']}",
+                    new_data = [tag['EPC-96'], f"{tag['AntennaID']}", f"{tag['PeakRSSI']}",
                                 lat, lon, speed, bearing, "-", self.api.user_name, tag['LastSeenTimestampUTC'],
                                 "", "", "", "", "", "", "", ""]
                     self.storage.add_record(new_data)
@@ -392,7 +435,9 @@ class OverviewScreen(BaseScreen):
             self.gps.stop()
         self.gps = GPS(port=port, baud_rate=baud)
         self.gps.sig_msg.connect(self._on_gps_status)
-        self.gps.start()
+        # The reader blocks on the port between sentences; let it preempt the
+        # UI and upload work as soon as bytes arrive
+        self.gps.start(QThread.Priority.HighPriority)
         # RFID will access GPS through gps_getter function, so no need to update reference
         self._set_gps_status("External GPS Connected", True)
 
@@ -417,21 +462,20 @@ class OverviewScreen(BaseScreen):
                     self.ui.last_gps_time.setText(get_date_from_utc(gps_timestamp))
 
     def _check_internet_status(self):
-        """Check internet connectivity by pinging Google DNS"""
-        try:
-            response_time = ping("8.8.8.8", timeout=3)
-            if response_time is not None:
-                self._set_internet_status("Connected", True)
-                logger.debug(f"Internet ping successful: {response_time:.2f}ms")
-                # Reset disconnection timer when connected
-                self.internet_disconnected_start = None
-            else:
-                self._set_internet_status("Disconnected", False)
-                logger.debug("Internet ping failed: no response")
-                self._handle_internet_disconnection()
-        except Exception as e:
+        """Check internet connectivity with a DNS query to Google DNS"""
+        # A probe still in flight (up to its 3 s timeout) answers for this tick too
+        if not self.internet_check.isRunning():
+            self.internet_check.start()
+
+    def _on_internet_checked(self, response_time):
+        if response_time is not None:
+            self._set_internet_status("Connected", True)
+            logger.debug(f"Internet check successful: {response_time:.2f}ms")
+            # Reset disconnection timer when connected
+            self.internet_disconnected_start = None
+        else:
             self._set_internet_status("Disconnected", False)
-            logger.debug(f"Internet ping error: {e}")
+            logger.debug("Internet check failed: no DNS response")
             self._handle_internet_disconnection()
 
     def _handle_internet_disconnection(self):
@@ -553,21 +597,9 @@ class OverviewScreen(BaseScreen):
             payload.append(record)
             uploaded_record_ids.append(row[0])  # Track the record ID (first column)
         
-        if payload and self.api.upload_records(payload):
-            # Delete the successfully uploaded records
+        uploaded_record_ids = self.api.upload_records_batched(payload, uploaded_record_ids)
+        if uploaded_record_ids:
+            # Delete the records from every chunk that was accepted
             self.storage.delete_uploaded_records(uploaded_record_ids)
             # Also do best-effort pruning for any old records
             self.storage.prune_old()
-
-
-def calculate_next_id(used_ids):
-    smallest_available_id = 1
-    for record in used_ids:
-        current_id = record[0]
-        if current_id == smallest_available_id:
-            smallest_available_id += 1
-        else:
-            break
-    return smallest_available_id
-
-
@@ -47,12 +47,12 @@ echo ""
 echo -e "${YELLOW}Step 1: Building PyInstaller executable...${NC}"
 if command -v pyinstaller &> /dev/null; then
     echo -e "   ${GREEN}SUCCESS${NC} PyInstaller found"
-    pyinstaller --clean --onefile --icon=ui/img/icon.ico --name=NexusRFIDReader main.py
+    pyinstaller --clean --onefile --optimize 2 --icon=ui/img/icon.ico --name=NexusRFIDReader main.py
     echo -e "   ${GREEN}SUCCESS${NC} Executable built successfully"
 else
     echo -e "   ${RED}ERROR: PyInstaller not found. Installing...${NC}"
     pip3 install pyinstaller
-    pyinstaller --clean --onefile --icon=ui/img/icon.ico --name=NexusRFIDReader main.py
+    pyinstaller --clean --onefile --optimize 2 --icon=ui/img/icon.ico --name=NexusRFIDReader main.py
     echo -e "   ${GREEN}SUCCESS${NC} PyInstaller installed and executable built"
 fi
 
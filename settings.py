@@ -48,6 +48,9 @@ def get_default_config():
             "tag_population": 4,
             "impinj_search_mode": None,
             "impinj_reports": False,
+            # Wrap arp-scan in `stdbuf -oL` so discovery can stop at the first reader; with sudo this
+            # changes the privileged command, so sudoers must allow `stdbuf -oL arp-scan ...` as well
+            "arp_scan_line_buffered": False,
         },
         "api_config": {
             "login_url": "",
@@ -65,6 +68,8 @@ def get_default_config():
             "site_id": "019a9e1e-81ff-75ab-99fc-4115bb92fec6",
             "record_interval_ms": 7000,
             "health_interval_ms": 15000,
+            "upload_concurrency": 4,
+            "gzip_upload": False,
         },
         "database_config": {
             "use_db": True,
@@ -147,6 +152,13 @@ DATABASE_CONFIG = _config["database_config"]
 FILTER_CONFIG = _config["filter_config"]
 BAUD_RATE_DON = _config["baud_rate_don"]
 INTERNET_LIMIT_TIME = _config["internet_limit_time"]
+# Bumped on every successful reload_config() so consumers can cache values derived from the configs
+_config_version = 0
+
+
+def config_version():
+    """Return the current configuration version."""
+    return _config_version
 
 
 def update_rfid_host(new_host: str):
@@ -165,7 +177,7 @@ def update_rfid_host(new_host: str):
 
 def reload_config():
     """Reload configuration from JSON file and update all config dictionaries in place"""
-    global GPS_CONFIG, RFID_CONFIG, API_CONFIG, DATABASE_CONFIG, FILTER_CONFIG, BAUD_RATE_DON, INTERNET_LIMIT_TIME
+    global GPS_CONFIG, RFID_CONFIG, API_CONFIG, DATABASE_CONFIG, FILTER_CONFIG, BAUD_RATE_DON, INTERNET_LIMIT_TIME, _config_version
     try:
         new_config = load_config()
         # Update dictionaries in place so existing references reflect changes
@@ -188,6 +200,7 @@ def reload_config():
         BAUD_RATE_DON = new_config["baud_rate_don"]
         INTERNET_LIMIT_TIME = new_config["internet_limit_time"]
         
+        _config_version += 1
         return True
     except Exception as e:
         print(f"Error reloading config: {e}")
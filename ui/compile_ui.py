@@ -1,7 +1,10 @@
 import glob
+import io
 import ntpath
 import os
 import platform
+import re
+import tokenize
 
 
 _cur_dir = os.path.dirname(os.path.realpath(__file__))
@@ -14,6 +17,49 @@ ui_folders = [
 
 RC_NAME = "pl"
 
+_QT_IMPORT_RE = re.compile(r"^from (PySide6\.\w+) import (\([^)]*\)|[^\n]+)\n", re.MULTILINE)
+
+
+def _format_import(module, names):
+    if len(names) == 1:
+        return f"from {module} import {names[0]}\n"
+    lines = []
+    line = f"from {module} import ("
+    for i, name in enumerate(names):
+        item = name + (")" if i == len(names) - 1 else ", ")
+        if len(line + item.rstrip()) > 80:
+            lines.append(line.rstrip())
+            line = "    "
+        line += item
+    lines.append(line)
+    return "\n".join(lines) + "\n"
+
+
+def prune_qt_imports(py_file):
+    """Drop the names from uic's blanket PySide6 imports that the generated module never uses."""
+    with open(py_file, "r") as f:
+        source = f.read()
+    imports = list(_QT_IMPORT_RE.finditer(source))
+    if not imports:
+        return
+    # Only real identifiers count, not names that appear inside style sheet strings
+    body = source[imports[-1].end():]
+    used = {tok.string for tok in tokenize.generate_tokens(io.StringIO(body).readline)
+            if tok.type == tokenize.NAME}
+    pruned = []
+    for m in imports:
+        names = [n for n in re.findall(r"\w+", m.group(2)) if n in used]
+        pruned.append(_format_import(m.group(1), names) if names else "")
+    out = []
+    pos = 0
+    for m, text in zip(imports, pruned):
+        out.append(source[pos:m.start()])
+        out.append(text)
+        pos = m.end()
+    out.append(source[pos:])
+    with open(py_file, "w") as f:
+        f.write("".join(out))
+
 
 def compile_ui():
 
@@ -21,7 +67,7 @@ def compile_ui():
         for ui_file in glob.glob(os.path.join(ui_folder, "*.ui")):
             name = ntpath.basename(ui_file).split(".")[0]
             py_file = os.path.join(ui_folder, f"ui_{name}.py")
-            os.system(f"pyside6-uic {ui_file} > {py_file}")
+            os.system(f"pyside6-uic --no-autoconnection {ui_file} > {py_file}")
 
     os.system(f"pyside6-rcc -o {_cur_dir}/{RC_NAME}_rc.py {_cur_dir}/{RC_NAME}.qrc")
 
@@ -42,6 +88,8 @@ def compile_ui():
                                 f"import {RC_NAME}_rc", f"import ui.{RC_NAME}_rc"
                             )
                         )
+            # uic imports a fixed list of Qt names; keep only the ones this module uses
+            prune_qt_imports(rc)
 
 
 if __name__ == "__main__":
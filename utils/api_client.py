@@ -1,24 +1,63 @@
 import time
+import threading
 import uuid
 import json
 import os
 import base64
+import gzip
+import socket
 import hashlib
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
+import numpy as np
+import orjson
 import requests
 from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
 from urllib3.util.retry import Retry
 
 from settings import API_CONFIG
 from utils.logger import logger
 
 
+class KeepAliveAdapter(HTTPAdapter):
+    """HTTPAdapter whose sockets use TCP keepalive so idle pooled connections survive NAT timeouts"""
+
+    # urllib3's defaults already set TCP_NODELAY
+    socket_options = HTTPConnection.default_socket_options + [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+    if hasattr(socket, "TCP_KEEPIDLE"):  # Not available on every platform (e.g. macOS)
+        socket_options.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 60))
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["socket_options"] = self.socket_options
+        return super().init_poolmanager(*args, **kwargs)
+
+
+# After a failed token refresh, uploads without a token are skipped for this
+# long instead of blocking on another auth round trip
+_AUTH_RETRY_BACKOFF_S = 30
+
+# Smaller bodies don't gain enough from compression to be worth the CPU
+_GZIP_MIN_BYTES = 2048
+
+# Node id is fixed for the life of the process, so format it once
+_MAC_ADDRESS = '-'.join(('%012X' % uuid.getnode())[i:i + 2] for i in range(0, 12, 2))
+
+
 class ApiClient:
 
     def __init__(self):
         self.token = None
         self.token_expires_at = 0
+        self._last_auth_failure_at = 0.0
+        self._token_lock = threading.Lock()
+        self._cached_headers = None
+        self._cached_headers_for = None
+        self._upload_workers = max(1, int(API_CONFIG.get('upload_concurrency', 4)))
+        # One pooled session for all calls so keep-alive connections are reused
+        self.http = self._session()
+        self._pool = ThreadPoolExecutor(max_workers=self._upload_workers, thread_name_prefix="upload")
         self._update_config_values()
 
     def _update_config_values(self):
@@ -33,6 +72,7 @@ class ApiClient:
         self.health_url = API_CONFIG.get('health_url')
         self.record_url = API_CONFIG.get('record_url')
         self.user_name = API_CONFIG.get('user_name', 'Unknown')
+        self.gzip_upload = bool(API_CONFIG.get('gzip_upload', False))
 
     def update_config(self):
         """Update config values when configuration is reloaded"""
@@ -41,12 +81,18 @@ class ApiClient:
 
     def _session(self):
         retry_strategy = Retry(total=1, backoff_factor=1, status_forcelist=[429, 500, 502, 503, 504], allowed_methods=["HEAD", "GET", "OPTIONS", "POST"])  # type: ignore
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        # Keep at least one pooled connection per upload worker
+        adapter = KeepAliveAdapter(pool_connections=4, pool_maxsize=max(8, self._upload_workers), max_retries=retry_strategy)
         http = requests.Session()
         http.mount("https://", adapter)
         http.mount("http://", adapter)
         return http
 
+    def close(self):
+        """Stop the upload workers and close the pooled HTTP session"""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self.http.close()
+
     def _decrypt_config_value(self, value: str | None) -> str | None:
         """Decrypt a config value using a static, in-code obfuscation scheme.
 
@@ -74,19 +120,19 @@ class ApiClient:
             # LCG parameters (Numerical Recipes): state = (a*state + c) mod 2^32
             a = 1664525
             c = 1013904223
-            mod = 2 ** 32
             state = 0xA3C59AC3  # embedded seed
 
-            def next_key_byte() -> int:
-                nonlocal state
-                state = (a * state + c) % mod
-                return (state >> 24) & 0xFF
+            # Unrolled recurrence: state_i = a^i*seed + c*(a^0 + ... + a^(i-1)),
+            # evaluated for the whole stream at once with wrapping uint32 math
+            n = len(data)
+            powers = np.cumprod(np.full(n, a, dtype=np.uint32), dtype=np.uint32)  # a^1 .. a^n
+            sums = np.cumsum(np.concatenate(([1], powers[:-1])).astype(np.uint32), dtype=np.uint32)  # a^0 + .. + a^(i-1)
+            states = powers * np.uint32(state) + sums * np.uint32(c)
+            keys = (states >> 24).astype(np.uint8)
 
-            out = bytearray(len(data))
-            for i, b in enumerate(data):
-                k = next_key_byte()
-                out[i] = ((b - (i % 256)) & 0xFF) ^ k
-            return out.decode("utf-8")
+            offsets = (np.arange(n) & 0xFF).astype(np.uint8)  # i % 256
+            out = (np.frombuffer(data, dtype=np.uint8) - offsets) ^ keys
+            return out.tobytes().decode("utf-8")
         except Exception as exc:
             logger.warning(f"Failed to decrypt config value (static), using as-is: {exc}")
             return value
@@ -104,9 +150,8 @@ class ApiClient:
             'content-type': 'application/json'
         }
         
-        http = self._session()
         try:
-            response = http.post(self.auth0_url, headers=headers, data=payload, timeout=10)
+            response = self.http.post(self.auth0_url, headers=headers, data=payload, timeout=10)
             response.raise_for_status()
             if response.status_code == 200:
                 data = response.json()
@@ -119,42 +164,62 @@ class ApiClient:
                     return True
         except Exception as e:
             logger.error(f"Auth0 token refresh failed: {e}")
-        finally:
-            http.close()
         return False
 
     def _headers(self):
-        # Check if token needs refresh (refresh 2 minutes early to avoid blocking during upload)
-        if not self.token or time.time() >= (self.token_expires_at - 120):
-            if not self.refresh_token():
-                logger.warning("Failed to refresh token, proceeding without authentication")
-        
-        headers = {
-            "Content-Type": "application/json",
-            "accept": "application/json",
-            "idempotency-Key": "1"
-        }
-        if self.token:
-            headers["Authorization"] = f"Bearer {self.token}"
-        return headers
+        # Fast path: headers already built for the current, still-fresh token
+        if (self._cached_headers is not None
+                and self._cached_headers_for == (self.token, self.token_expires_at)
+                and time.time() < self.token_expires_at - 120):
+            return self._cached_headers
+
+        with self._token_lock:
+            # Check if token needs refresh (refresh 2 minutes early to avoid blocking during upload).
+            # Re-checked under the lock so concurrent callers trigger a single refresh.
+            if not self.token or time.time() >= (self.token_expires_at - 120):
+                if self._auth_backing_off():
+                    logger.debug("Token refresh failed recently, not retrying yet")
+                elif self.refresh_token():
+                    self._last_auth_failure_at = 0.0
+                else:
+                    self._last_auth_failure_at = time.time()
+                    logger.warning("Failed to refresh token, proceeding without authentication")
+
+            headers = {
+                "Content-Type": "application/json",
+                "accept": "application/json",
+                "idempotency-Key": "1"
+            }
+            if self.token:
+                headers["Authorization"] = f"Bearer {self.token}"
+            # Only memoize headers carrying a token that is still fresh
+            if self.token and time.time() < self.token_expires_at - 120:
+                self._cached_headers = headers
+                self._cached_headers_for = (self.token, self.token_expires_at)
+            return headers
+
+    def _auth_backing_off(self):
+        """True while the last token refresh failed less than _AUTH_RETRY_BACKOFF_S ago"""
+        # Without an auth endpoint there is nothing to wait for. A stale token
+        # left over from before the failure does not end the backoff.
+        return bool(self.auth0_url) and time.time() - self._last_auth_failure_at < _AUTH_RETRY_BACKOFF_S
 
     def upload_health(self, rfid_status: bool, gps_status_text: str, lat: float, lon: float):
-        if not self.health_url:
+        if not self.health_url or self._auth_backing_off():
             return False
         payload = {
             "userName": self.user_name,
             "rfidStatus": "Connected" if rfid_status else "Disconnected",
             "gpsStatus": gps_status_text,
-            "macAddress": '-'.join(('%012X' % uuid.getnode())[i:i + 2] for i in range(0, 12, 2)),
+            "macAddress": _MAC_ADDRESS,
             "lat": lat,
             "lng": lon,
-            "dateTime": datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
+            "dateTime": datetime.now().isoformat(timespec='seconds')
         }
-        http = self._session()
         try:
-            response = http.post(self.health_url, headers=self._headers(), json=payload, timeout=10)
+            response = self.http.post(self.health_url, headers=self._headers(), data=orjson.dumps(payload), timeout=10)
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
             # Check for new API response format
             if data.get('isSuccess') == True and data.get('status') == 'Ok':
                 logger.debug(f"Health data uploaded successfully: {payload['userName']} - RFID: {payload['rfidStatus']}, GPS: {payload['gpsStatus']}")
@@ -182,17 +247,41 @@ class ApiClient:
         except Exception as e:
             # Any other unexpected error
             logger.error(f"Uploading health data failed: Unexpected error - {type(e).__name__}: {str(e)}")
-        finally:
-            http.close()
         return False
 
     def upload_records(self, payload):
-        if not self.record_url:
+        if not self.record_url or self._auth_backing_off():
             return False
-        
+        return self._post_records(payload, self._headers())
+
+    def upload_records_batched(self, payload, record_ids, batch_size=200):
+        """Upload records in chunks of batch_size, one POST per chunk.
+
+        record_ids is parallel to payload. Returns the ids of the records whose
+        chunk was accepted, so only those get deleted from local storage.
+        """
+        if not self.record_url or not payload or self._auth_backing_off():
+            return []
+        # One token check per flush, shared by every chunk
+        headers = self._headers()
+        # Chunks go out concurrently over the pooled session
+        futures = {
+            self._pool.submit(self._post_records, payload[start:start + batch_size], headers): start
+            for start in range(0, len(payload), batch_size)
+        }
+        uploaded_ids = []
+        for future in as_completed(futures):
+            if future.result():
+                start = futures[future]
+                uploaded_ids.extend(record_ids[start:start + batch_size])
+        return uploaded_ids
+
+    def _post_records(self, payload, headers):
         # Calculate record count and payload size for logging
         record_count = len(payload) if isinstance(payload, list) else 1
-        payload_size = len(json.dumps(payload).encode('utf-8'))
+        # Serialize once: the same bytes are sized for logging and sent as the body
+        body = orjson.dumps(payload)
+        payload_size = len(body)
         
         # Use longer timeout for large payloads: base 15s + 2s per 50 records, max 60s
         # This accounts for slow upload speeds on networks
@@ -200,16 +289,21 @@ class ApiClient:
         
         logger.debug(f"Uploading {record_count} record(s), payload size: {payload_size / 1024:.2f} KB, timeout: {timeout_seconds}s")
         
-        http = self._session()
+        # Record JSON repeats the same keys for every row, so it compresses well.
+        # Only when the server is configured to accept gzip request bodies
+        if self.gzip_upload and payload_size > _GZIP_MIN_BYTES:
+            body = gzip.compress(body, compresslevel=1)
+            headers = {**headers, "Content-Encoding": "gzip"}
+        
         try:
-            response = http.post(
+            response = self.http.post(
                 self.record_url, 
-                headers=self._headers(), 
-                json=payload, 
+                headers=headers, 
+                data=body, 
                 timeout=timeout_seconds
             )
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
             
             # Check for new API response format
             if data.get('isSuccess') == True and data.get('status') == 'Ok':
@@ -241,8 +335,6 @@ class ApiClient:
         except Exception as e:
             # Any other unexpected error
             logger.error(f"Uploading records failed: Unexpected error - {type(e).__name__}: {str(e)}")
-        finally:
-            http.close()
         return False
 
 
@@ -1,10 +1,13 @@
-import re
+import functools
+import ipaddress
 import time
 import uuid
 import platform
+import socket
 import subprocess
 import os
-from datetime import datetime
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from geopy.distance import geodesic
 from geographiclib.geodesic import Geodesic
@@ -19,16 +22,11 @@ from utils.logger import logger
 def convert_to_decimal(coord, direction, is_latitude):
     try:
         sign = -1 if direction in ['S', 'W'] else 1
-        if is_latitude:
-            if len(coord) < 4:
-                raise ValueError("Invalid latitude coordinate format")
-            degrees = int(coord[:2])
-            minutes = float(coord[2:])
-        else:
-            if len(coord) < 5:
-                raise ValueError("Invalid longitude coordinate format")
-            degrees = int(coord[:3])
-            minutes = float(coord[3:])
+        if len(coord) < (4 if is_latitude else 5):
+            raise ValueError("Invalid latitude coordinate format" if is_latitude else "Invalid longitude coordinate format")
+        # NMEA packs (d)ddmm.mmmm into one number: split it arithmetically
+        # instead of slicing the string
+        degrees, minutes = divmod(float(coord), 100)
         decimal_coord = sign * (degrees + minutes / 60)
         return decimal_coord
     except ValueError:
@@ -50,16 +48,9 @@ def extract_from_gps(gps_data):
 
 def get_date_from_utc(timestamp_microseconds):
     timestamp_seconds = timestamp_microseconds / 1_000_000
-    utc_datetime = datetime.utcfromtimestamp(timestamp_seconds)
-    formatted_date = "{}/{:02}/{:02} {:02}:{:02}:{:02}".format(
-        utc_datetime.year,
-        utc_datetime.month,
-        utc_datetime.day,
-        utc_datetime.hour,
-        utc_datetime.minute,
-        utc_datetime.second,
-    )
-    return formatted_date
+    utc_datetime = datetime.fromtimestamp(timestamp_seconds, tz=timezone.utc)
+    return (f"{utc_datetime.year}/{utc_datetime.month:02}/{utc_datetime.day:02} "
+            f"{utc_datetime.hour:02}:{utc_datetime.minute:02}:{utc_datetime.second:02}")
 
 
 def calculate_speed_bearing(lat1, lon1, time1, lat2, lon2, time2):
@@ -73,14 +64,41 @@ def calculate_speed_bearing(lat1, lon1, time1, lat2, lon2, time2):
 
 
 def is_ipv4_address(ip):
-    ipv4_regex = re.compile(r'^(?:\d{1,3}\.){3}\d{1,3}$')
-    if ipv4_regex.match(ip):
-        parts = ip.split('.')
-        if all(0 <= int(part) <= 255 for part in parts):
-            return True
-    return False
+    if not isinstance(ip, str):
+        return False
+    try:
+        ipaddress.IPv4Address(ip)
+        return True
+    except ValueError:
+        return False
+
 
+# Minimal DNS query (id 0x4e58, recursion desired, one question: root zone, type NS)
+_DNS_PROBE_QUERY = b'\x4e\x58\x01\x00\x00\x01\x00\x00\x00\x00\x00\x00\x00\x00\x02\x00\x01'
 
+
+def dns_probe(host="8.8.8.8", timeout=3):
+    """
+    Round-trip a minimal DNS query to host over UDP.
+    Returns the response time in ms, or None if no reply arrived within timeout.
+    Unlike an ICMP ping it needs no raw socket privileges.
+    """
+    start = time.perf_counter()
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            sock.settimeout(timeout)
+            # Connected, so an ICMP port/host unreachable fails fast instead of timing out
+            sock.connect((host, 53))
+            sock.send(_DNS_PROBE_QUERY)
+            reply = sock.recv(512)
+    except OSError:
+        return None
+    if reply[:2] != _DNS_PROBE_QUERY[:2]:
+        return None
+    return (time.perf_counter() - start) * 1000
+
+
+@functools.lru_cache(maxsize=1)
 def get_mac_address():
     mac_address = hex(uuid.getnode())
     mac_address = mac_address[2:]
@@ -88,6 +106,33 @@ def get_mac_address():
     return formatted_mac_address
 
 
+_AT_READ_TIMEOUT_S = 0.1
+
+
+def _read_at_response(ser, timeout):
+    """
+    Collect AT response lines until a final result code (OK/ERROR) or until
+    timeout seconds have passed.
+    """
+    lines = []
+    partial = b''
+    # One short per-read timeout set up front; the overall deadline is checked
+    # in the loop so the port is not reconfigured on every read
+    ser.timeout = min(_AT_READ_TIMEOUT_S, timeout)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        partial += ser.read_until(b'\n', 256)
+        if not partial.endswith(b'\n') and len(partial) < 256:
+            continue  # Nothing or only part of a line yet
+        line = partial.decode('utf-8', errors='ignore').strip()
+        partial = b''
+        if line:
+            lines.append(line)
+            if line in ('OK', 'ERROR') or line.startswith('+CME ERROR'):
+                break
+    return lines
+
+
 def enable_gps_at_command():
     """
     Send AT+QGPS=1 command to ttyUSB2 to enable GPS.
@@ -123,25 +168,12 @@ def enable_gps_at_command():
         ser.write(command_bytes)
         logger.info(f"✓ Command sent: {command_bytes}")
         
-        # Wait for GPS to initialize
-        if wait_time > 0:
-            logger.debug(f"Waiting {wait_time} seconds for GPS to initialize...")
-            time.sleep(wait_time)
-        
-        # Read response (optional, but helpful for debugging)
+        # Wait for the modem's final result code; blocking reads let the
+        # kernel do the waiting and return as soon as OK/ERROR arrives
         logger.debug("Reading response...")
-        response_lines = []
-        start_time = time.time()
-        timeout = 2.0  # 2 second timeout for reading
-        
-        while (time.time() - start_time) < timeout:
-            if ser.in_waiting > 0:
-                line = ser.readline().decode('utf-8', errors='ignore').strip()
-                if line:
-                    response_lines.append(line)
-                    logger.debug(f"  Response: {line}")
-            else:
-                time.sleep(0.1)
+        response_lines = _read_at_response(ser, wait_time + 2.0)
+        for line in response_lines:
+            logger.debug(f"  Response: {line}")
         
         if response_lines:
             logger.info(f"✓ Received {len(response_lines)} response line(s)")
@@ -165,9 +197,59 @@ def enable_gps_at_command():
         logger.warning(f"Failed to send AT+QGPS=1 command to {port}: {e}")
         return False
 
+def _send_gps_enable(port, try_rate, command, wait_time):
+    """Send the GPS enable AT command to one port. Returns True if the port accepted it."""
+    try:
+        logger.debug(f"Trying port: {port} at {try_rate} baud...")
+        ser = serial.Serial(
+            port=port,
+            baudrate=try_rate,
+            timeout=1,
+            write_timeout=1,
+            rtscts=True,
+            dsrdtr=True
+        )
+        logger.debug(f"✓ Connected to {port}")
+        
+        # Clear any existing data in buffer (like enable_gps_at_command)
+        ser.reset_input_buffer()
+        ser.reset_output_buffer()
+        
+        # Prepare command (add carriage return like minicom)
+        at_command = command if command.endswith('\r') else command + '\r'
+        command_bytes = at_command.encode('utf-8')
+        
+        # Send command
+        logger.debug(f"Sending command: {command} to {port}")
+        ser.write(command_bytes)
+        logger.debug(f"✓ Command sent to {port}: {command_bytes}")
+        
+        # Wait for the final result code (shorter than enable_gps_at_command)
+        response_lines = _read_at_response(ser, wait_time + 1.0)
+        
+        if response_lines:
+            logger.debug(f"✓ Received {len(response_lines)} response line(s) from {port}")
+        else:
+            logger.debug(f"No response from {port} (this may be normal)")
+        
+        # Close connection
+        ser.close()
+        logger.info(f"✓ Successfully sent AT+QGPS=1 to {port}")
+        logger.debug(f"✓ Connection closed for {port}")
+        return True
+        
+    except serial.SerialException as e:
+        logger.debug(f"Port {port} serial error: {e}")
+    except PermissionError as e:
+        logger.debug(f"Permission denied accessing {port}: {e}")
+    except (OSError, Exception) as e:
+        logger.debug(f"Port {port} error: {e}")
+    return False
+
+
 def pre_config_gps():
     """
-    Pre-configure GPS by sending AT+QGPS=1 to all available ports.
+    Pre-configure GPS by sending AT+QGPS=1 to the available ports until one takes it.
     Works the same way as enable_gps_at_command() for each port.
     Returns the baud rate to use for GPS scanning.
     """
@@ -183,119 +265,89 @@ def pre_config_gps():
     wait_time = 2.0
     
     logger.info("Attempting to enable GPS on all ports with AT+QGPS=1 command...")
-    for port in serial_ports:
+    if serial_ports:
+        # Probe the ports side by side and stop at the first that takes the
+        # command; probes not yet started are cancelled, so the command is not
+        # sent on to unrelated serial devices
+        executor = ThreadPoolExecutor(max_workers=min(8, len(serial_ports)))
         try:
-            logger.debug(f"Trying port: {port} at {try_rate} baud...")
-            ser = serial.Serial(
-                port=port,
-                baudrate=try_rate,
-                timeout=1,
-                write_timeout=1,
-                rtscts=True,
-                dsrdtr=True
-            )
-            logger.debug(f"✓ Connected to {port}")
-            
-            # Clear any existing data in buffer (like enable_gps_at_command)
-            ser.reset_input_buffer()
-            ser.reset_output_buffer()
-            
-            # Prepare command (add carriage return like minicom)
-            at_command = command if command.endswith('\r') else command + '\r'
-            command_bytes = at_command.encode('utf-8')
-            
-            # Send command
-            logger.debug(f"Sending command: {command} to {port}")
-            ser.write(command_bytes)
-            logger.debug(f"✓ Command sent to {port}: {command_bytes}")
-            
-            # Wait for GPS to initialize
-            if wait_time > 0:
-                logger.debug(f"Waiting {wait_time} seconds for GPS to initialize...")
-                time.sleep(wait_time)
-            
-            # Read response (optional, but helpful for debugging)
-            response_lines = []
-            start_time = time.time()
-            timeout = 1.0  # 1 second timeout for reading (shorter than enable_gps_at_command)
-            
-            while (time.time() - start_time) < timeout:
-                if ser.in_waiting > 0:
-                    line = ser.readline().decode('utf-8', errors='ignore').strip()
-                    if line:
-                        response_lines.append(line)
-                        # logger.debug(f"  Response from {port}: {line}")
-                else:
-                    time.sleep(0.1)
-            
-            if response_lines:
-                logger.debug(f"✓ Received {len(response_lines)} response line(s) from {port}")
-            else:
-                logger.debug(f"No response from {port} (this may be normal)")
-            
-            # Close connection
-            ser.close()
-            logger.info(f"✓ Successfully sent AT+QGPS=1 to {port}")
-            logger.debug(f"✓ Connection closed for {port}")
-            
-            return try_rate
-            
-        except serial.SerialException as e:
-            logger.debug(f"Port {port} serial error: {e}")
-            pass
-        except PermissionError as e:
-            logger.debug(f"Permission denied accessing {port}: {e}")
-            pass
-        except (OSError, Exception) as e:
-            logger.debug(f"Port {port} error: {e}")
-            pass
+            futures = {executor.submit(_send_gps_enable, port, try_rate, command, wait_time): port
+                       for port in serial_ports}
+            for future in as_completed(futures):
+                if future.result():
+                    logger.info(f"GPS enabled via port: {futures[future]}")
+                    return try_rate
+        finally:
+            # Don't wait on the slower probes; they close their ports when done
+            executor.shutdown(wait=False, cancel_futures=True)
     
     logger.debug("No port responded to AT command, using default baud rate")
     return settings.GPS_CONFIG.get('baud_rate', settings.BAUD_RATE_DON) or settings.BAUD_RATE_DON
 
 
+def _probe_gps_port(port, baud_rate):
+    """Return True if NMEA sentences are read from the port."""
+    try:
+        with serial.Serial(port, baudrate=baud_rate, timeout=1, rtscts=True, dsrdtr=True) as ser:
+            # Try multiple reads to catch GPS data
+            # readline blocks for up to the port timeout, no need to poll in_waiting
+            for attempt in range(5):
+                line = ser.readline().decode('utf-8', errors='ignore').strip()
+                logger.debug(f"Port {port} attempt {attempt + 1}: {line[:50]}...")  # Log first 50 chars
+                if line.startswith('$G'):
+                    return True
+            logger.debug(f"No GPS data found on port {port} after 5 attempts")
+    except (OSError, serial.SerialException) as e:
+        logger.debug(f"Port {port} error: {e}")
+    return False
+
+
 def find_gps_port(baud_rate):
     serial_ports = [port.device for port in serial.tools.list_ports.comports()]
     logger.debug(f"Available ports:{serial_ports}")
+    if not serial_ports:
+        logger.info("No GPS port found")
+        return None
     
-    # Try each port multiple times to ensure we catch GPS data
-    for port in serial_ports:
-        try:
-            with serial.Serial(port, baudrate=baud_rate, timeout=1, rtscts=True, dsrdtr=True) as ser:
-                # Try multiple reads to catch GPS data
-                for attempt in range(5):
-                    buffer = ser.in_waiting
-                    if buffer < 80:
-                        time.sleep(0.2)  # Wait a bit longer for data
-                    line = ser.readline().decode('utf-8', errors='ignore').strip()
-                    logger.debug(f"Port {port} attempt {attempt + 1}: {line[:50]}...")  # Log first 50 chars
-                    if line.startswith('$G'):
-                        logger.info(f"GPS found on port: {port}")
-                        return port
-                logger.debug(f"No GPS data found on port {port} after 5 attempts")
-        except (OSError, serial.SerialException) as e:
-            logger.debug(f"Port {port} error: {e}")
-            pass
+    # Probe all ports at once and take the first that yields NMEA data
+    executor = ThreadPoolExecutor(max_workers=min(8, len(serial_ports)))
+    try:
+        futures = {executor.submit(_probe_gps_port, port, baud_rate): port for port in serial_ports}
+        for future in as_completed(futures):
+            if future.result():
+                port = futures[future]
+                logger.info(f"GPS found on port: {port}")
+                return port
+    finally:
+        # Don't wait on the slower probes; they close their ports when done
+        executor.shutdown(wait=False, cancel_futures=True)
     logger.info("No GPS port found")
     return None
 
 
-def find_smallest_available_id(used_ids):
-    smallest_available_id = 1
-    for record in used_ids:
-        current_id = record[0]
-        if current_id == smallest_available_id:
-            smallest_available_id += 1
-        else:
-            break
-    return smallest_available_id
+# Processor ID once it has been read; the MAC fallback is never stored here so
+# a failed read is retried on the next call
+_processor_id = None
 
 
 def get_processor_id():
     """
     Get the processor ID for both Windows and Raspberry Pi systems.
-    Returns the full processor ID as a string.
+    Returns the full processor ID as a string, or the MAC address if it cannot be read.
+    The ID cannot change while the device is running, so it is only read until that succeeds.
     """
+    global _processor_id
+    if _processor_id is None:
+        _processor_id = _read_processor_id()
+    if _processor_id is not None:
+        return _processor_id
+    # Fallback to MAC address if processor ID cannot be obtained
+    logger.info("Using MAC address as fallback for device ID")
+    return get_mac_address()
+
+
+def _read_processor_id():
+    """Read the processor ID (Windows) or board serial (Raspberry Pi); None if unavailable."""
     try:
         if platform.system() == 'Windows':
             # For Windows, use wmic to get processor ID
@@ -325,9 +377,6 @@ def get_processor_id():
                                 return serial
     except Exception as e:
         logger.warning(f"Failed to get processor ID: {e}")
-    
-    # Fallback to MAC address if processor ID cannot be obtained
-    logger.info("Using MAC address as fallback for device ID")
-    return get_mac_address()
+    return None
 
 
@@ -1,26 +1,50 @@
+import itertools
 import sqlite3
 import time
-from typing import List, Tuple, Optional
+from collections import deque
+from typing import Deque, List, Tuple, Optional
 
-from utils.common import find_smallest_available_id
 from utils.logger import logger
 from settings import DATABASE_FILE
 
 
+# Inserts are committed in batches: once this many are pending, or once this
+# many seconds have passed since the last commit
+COMMIT_BATCH_SIZE = 100
+COMMIT_INTERVAL_S = 1.0
+
+# id is left to SQLite (INTEGER PRIMARY KEY aliases the rowid)
+_INSERT_SQL = '''
+    INSERT INTO records
+    (rfidTag, antenna, RSSI, latitude, longitude, speed, heading, locationCode, username,
+    timestamp, tag1, value1, tag2, value2, tag3, value3, tag4, value4)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+
 class DataStorage:
 
     def __init__(self, use_db: bool, max_records: int = 100):
         self.use_db = use_db
         self.max_records = max_records
-        self.database: List[list] = []
+        # In-memory mode: the deque drops the oldest record once max_records is reached
+        self.database: Deque[list] = deque(maxlen=max_records)
+        self._memory_ids = itertools.count(1)
         self.db_connection: Optional[sqlite3.Connection] = None
         self.db_cursor: Optional[sqlite3.Cursor] = None
+        self._pending_inserts = 0
+        self._last_commit = time.time()
         if self.use_db:
             self._init_db()
 
     def _init_db(self):
         self.db_connection = sqlite3.connect(DATABASE_FILE)
         self.db_cursor = self.db_connection.cursor()
+        # WAL + NORMAL sync: commits append to the log instead of fsyncing the main DB
+        self.db_cursor.execute('PRAGMA journal_mode=WAL')
+        self.db_cursor.execute('PRAGMA synchronous=NORMAL')
+        self.db_cursor.execute('PRAGMA temp_store=MEMORY')
+        self.db_cursor.execute('PRAGMA mmap_size=67108864')
         self.db_cursor.execute('''
                             CREATE TABLE IF NOT EXISTS records (
                                 id INTEGER PRIMARY KEY,
@@ -44,35 +68,56 @@ class DataStorage:
                                 timestamp INTEGER NOT NULL
                             )
                         ''')
+        # Pruning and fetching both walk records in timestamp order
+        self.db_cursor.execute('CREATE INDEX IF NOT EXISTS idx_records_timestamp ON records(timestamp)')
         self.db_connection.commit()
 
     def close(self):
         if self.db_connection:
+            self.flush()
             self.db_connection.close()
 
-    def add_record(self, record_list):
+    def flush(self):
+        """Prune and commit inserts buffered since the last commit"""
+        if not self.use_db or not self._pending_inserts:
+            return
+        assert self.db_cursor and self.db_connection
+        self._prune_db()
+        self._commit()
+
+    def _commit(self):
+        assert self.db_connection
+        self.db_connection.commit()
+        self._pending_inserts = 0
+        self._last_commit = time.time()
+
+    def add_record(self, record_list) -> int:
+        """Store one record (all columns except id) and return the id assigned to it"""
         if self.use_db:
             assert self.db_cursor and self.db_connection
             # Ensure NOT NULL columns never receive None
             record_list = ["" if v is None else v for v in record_list]
-            self.db_cursor.execute('''
-                INSERT INTO records
-                (id, rfidTag, antenna, RSSI, latitude, longitude, speed, heading, locationCode, username,
-                timestamp, tag1, value1, tag2, value2, tag3, value3, tag4, value4)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', record_list)
-            self.db_connection.commit()
-            # Immediately prune old records to maintain max_records limit
-            self.prune_old()
+            # Executed right away so queries on this connection see the row;
+            # only the commit (and the prune that goes with it) is batched
+            self.db_cursor.execute(_INSERT_SQL, record_list)
+            record_id = self.db_cursor.lastrowid
+            self._record_inserted(1)
+            return record_id
         else:
-            self.database.append(record_list)
-            # Immediately prune old records to maintain max_records limit
-            if len(self.database) > self.max_records:
-                self.database = self.database[-self.max_records:]
+            record_id = next(self._memory_ids)
+            self.database.append([record_id, *record_list])
+            return record_id
+
+    def _record_inserted(self, count: int):
+        self._pending_inserts += count
+        if (self._pending_inserts >= COMMIT_BATCH_SIZE
+                or time.time() - self._last_commit >= COMMIT_INTERVAL_S):
+            self.flush()
 
     def fetch_all_records(self) -> List[Tuple]:
         if self.use_db:
             assert self.db_cursor
+            self.flush()
             self.db_cursor.execute('''
                 SELECT id, rfidTag, antenna, RSSI, latitude, longitude, speed, heading,
                 locationCode, username, tag1, value1, tag2, value2, tag3, value3, tag4, value4
@@ -87,26 +132,22 @@ class DataStorage:
         """Delete records beyond the max_records limit, keeping only the newest records"""
         if self.use_db:
             assert self.db_cursor and self.db_connection
-            # Count total records
-            self.db_cursor.execute('SELECT COUNT(*) FROM records')
-            total_count = self.db_cursor.fetchone()[0]
-            
-            # If we exceed the limit, delete the oldest records
-            if total_count > self.max_records:
-                records_to_delete = total_count - self.max_records
-                self.db_cursor.execute('''
-                    DELETE FROM records
-                    WHERE id IN (
-                        SELECT id FROM records
-                        ORDER BY timestamp ASC
-                        LIMIT ?
-                    )
-                ''', [records_to_delete])
-                self.db_connection.commit()
-        else:
-            # For in-memory storage, keep only the last max_records
-            if len(self.database) > self.max_records:
-                self.database = self.database[-self.max_records:]
+            self._prune_db()
+            self._commit()
+        # In-memory storage needs no pruning: the deque (maxlen=max_records)
+        # drops the oldest record on every append past the limit
+
+    def _prune_db(self):
+        assert self.db_cursor
+        # Delete only the overflow, oldest first, in one statement
+        self.db_cursor.execute('''
+            DELETE FROM records
+            WHERE id IN (
+                SELECT id FROM records
+                ORDER BY timestamp ASC
+                LIMIT max(0, (SELECT COUNT(*) FROM records) - ?)
+            )
+        ''', [self.max_records])
 
     def delete_uploaded_records(self, record_ids: List[int]):
         """Delete specific records by their IDs after successful upload"""
@@ -118,12 +159,13 @@ class DataStorage:
             # Delete records with the specified IDs
             placeholders = ','.join('?' for _ in record_ids)
             self.db_cursor.execute(f'DELETE FROM records WHERE id IN ({placeholders})', record_ids)
-            self.db_connection.commit()
+            self._commit()
             logger.debug(f"Deleted {len(record_ids)} uploaded record(s) from database")
         else:
             # For in-memory storage, filter out records with matching IDs
             initial_count = len(self.database)
-            self.database = [rec for rec in self.database if rec[0] not in record_ids]
+            id_set = set(record_ids)
+            self.database = deque((rec for rec in self.database if rec[0] not in id_set), maxlen=self.max_records)
             deleted_count = initial_count - len(self.database)
             if deleted_count > 0:
                 logger.debug(f"Deleted {deleted_count} uploaded record(s) from memory")
@@ -10,6 +10,17 @@ from settings import GPS_CONFIG
 from utils.logger import logger
 
 
+# NMEA sentences are at most 82 characters; anything far longer without a
+# newline is line noise
+_MAX_PARTIAL_SENTENCE = 1024
+_RMC_PREFIXES = (b'$GPRMC', b'$GNRMC')
+_RECONNECT_INTERVAL_S = 0.5
+_KNOTS_TO_MPH = 1.15078
+# The RMC fields returned by GPS.get_data()
+_RMC_FIELDS = ('timestamp', 'status', 'lat', 'lat_dir', 'lon', 'lon_dir',
+               'spd_over_grnd', 'true_course', 'datestamp')
+
+
 class GPS(QThread):
 
     sig_msg = Signal(bool)
@@ -19,9 +30,11 @@ class GPS(QThread):
         self.port = port
         self.baud_rate = baud_rate
         self._ser = None
+        self._rxbuf = bytearray()  # Bytes read from the port but not yet a full sentence
         self._b_stop = threading.Event()
-        self._data = {}
-        self._sdata = [0, 0]
+        self._rmc = None  # Last valid RMC sentence, parsed
+        self._data_cache = (None, {})  # (sentence, get_data() dict built from it)
+        self._sdata = (0, 0)  # (speed, course)
         self._last_data_timestamp = None  # Track when GPS data was last received
         self.connectivity = current_status
 
@@ -39,71 +52,101 @@ class GPS(QThread):
             return None
 
     def read_serial_data(self):
-        buffer = self._ser.in_waiting
-        if buffer < 80:
-            time.sleep(.2)
-        line = self._ser.readline().decode('utf-8', errors='ignore').strip()
-        if line.startswith('$GPRMC') or line.startswith('$GNRMC'):
-            try:
-                msg = pynmea2.parse(line)
-                for field in msg.fields:
-                    label, attr = field[:2]
-                    value = getattr(msg, attr)
-                    self._data[attr] = value
-                speed_knots = msg.spd_over_grnd if msg.spd_over_grnd is not None else 0
-                course_degrees = msg.true_course if msg.true_course is not None else 0
-                self._sdata = [speed_knots * 1.15078, course_degrees]
-                # Update timestamp when GPS data is successfully parsed
-                self._last_data_timestamp = int(time.time() * 1_000_000)
-                # logger.debug(f"GPS data parsed: lat={self._data.get('lat', 'N/A')}, lon={self._data.get('lon', 'N/A')}, speed={speed_knots}")
-                pass
-            except pynmea2.ParseError as e:
-                logger.debug(f"GPS parse error: {e}")
-                self._data = {}
-                self._sdata = [0, 0]
-        elif line.startswith('$G'):
-            # Log other GPS sentences for debugging
-            # logger.debug(f"GPS sentence: {line[:50]}...")
+        # Take everything the port has buffered in one read (blocking for up to
+        # the port timeout when it is empty) and handle every complete sentence
+        chunk = self._ser.read(self._ser.in_waiting or 1)
+        if not chunk:
+            return
+        self._rxbuf.extend(chunk)
+        while (nl := self._rxbuf.find(b'\n')) != -1:
+            line = bytes(self._rxbuf[:nl]).strip()
+            del self._rxbuf[:nl + 1]
+            # Only RMC carries the fields we use; every other sentence is
+            # dropped on its raw prefix, before any decoding or parsing
+            if line.startswith(_RMC_PREFIXES):
+                self._handle_rmc(line.decode('ascii', errors='ignore'))
+        if len(self._rxbuf) > _MAX_PARTIAL_SENTENCE:
+            # No line ending in sight: noise on the line, drop it
+            self._rxbuf.clear()
+
+    def _handle_rmc(self, line):
+        try:
+            msg = pynmea2.parse(line)
+            # Only speed and course are converted for every sentence; the other
+            # fields (timestamps included) wait until get_data() asks for them
+            speed_knots = msg.spd_over_grnd or 0
+            course_degrees = msg.true_course or 0
+            self._sdata = (speed_knots * _KNOTS_TO_MPH, course_degrees)
+            # Update timestamp (microseconds) when GPS data is successfully parsed
+            self._last_data_timestamp = time.time_ns() // 1000
+            self._rmc = msg
+            # logger.debug(f"GPS data parsed: lat={msg.lat}, lon={msg.lon}, speed={speed_knots}")
             pass
+        except (pynmea2.ParseError, ValueError) as e:
+            # A bad sentence must not reach run(), which treats errors as a lost port
+            logger.debug(f"GPS parse error: {e}")
+            self._rmc = None
+            self._sdata = (0, 0)
 
     def run(self):
-        self._ser = self._connect()
-        while self._ser is None and not self._b_stop.is_set():
+        try:
             self._ser = self._connect()
-
-        while not self._b_stop.is_set():
-            if self._ser is None:
+            while self._ser is None and not self._b_stop.is_set():
+                # Port missing or busy (e.g. the USB modem re-enumerating): retry without
+                # spinning; wait() returns at once when stop() is called
+                self._b_stop.wait(_RECONNECT_INTERVAL_S)
                 self._ser = self._connect()
-                time.sleep(.1)
-            else:
-                try:
-                    self.read_serial_data()
-                    if self.connectivity is False:
-                        self.connectivity = True
-                        self.sig_msg.emit(True)
-                except Exception:
-                    self._data = {}
-                    self._sdata = [0, 0]
-                    self._ser = None
-                    if self.connectivity is True:
-                        self.connectivity = False
-                        self.sig_msg.emit(False)
+
+            while not self._b_stop.is_set():
+                if self._ser is None:
+                    self._ser = self._connect()
+                    if self._ser is None:
+                        self._b_stop.wait(_RECONNECT_INTERVAL_S)
+                else:
+                    try:
+                        self.read_serial_data()
+                        if self.connectivity is False:
+                            self.connectivity = True
+                            self.sig_msg.emit(True)
+                    except (serial.SerialException, OSError):
+                        # Port went away (unplugged, modem reset): drop the fix and reconnect
+                        self._rmc = None
+                        self._sdata = (0, 0)
+                        self._ser = None
+                        self._rxbuf.clear()
+                        if self.connectivity is True:
+                            self.connectivity = False
+                            self.sig_msg.emit(False)
+        finally:
+            # The port is closed here, on the thread that reads it, never under a blocked read()
+            self._close_serial()
 
     def stop(self):
         self._b_stop.set()
-        self.wait(1)
-        self._close_serial()
+        # If the thread is still inside read() it closes the port itself on exit
+        if self.wait(1):
+            self._close_serial()
 
     def _close_serial(self):
         if self._ser and self._ser.is_open:
             self._ser.close()
         self._ser = None
+        self._rxbuf.clear()
 
     def is_alive(self):
         return not self._b_stop.is_set()
 
     def get_data(self):
-        return self._data
+        # Built on request, at most once per sentence; {} while there is no fix
+        msg = self._rmc
+        if msg is None:
+            return {}
+        cached_for, data = self._data_cache
+        if cached_for is not msg:
+            data = {field: getattr(msg, field) for field in _RMC_FIELDS}
+            # Swapped in as one tuple, safe against concurrent callers
+            self._data_cache = (msg, data)
+        return data
 
     def get_sdata(self):
         return self._sdata
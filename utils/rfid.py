@@ -1,13 +1,17 @@
+import contextlib
+import errno
+import functools
+import selectors
+import socket
 import threading
 import time
 
 from PySide6.QtCore import QThread, Signal
 from sllurp.llrp import LLRP_DEFAULT_PORT, LLRPReaderConfig, LLRPReaderClient
-from ping3 import ping
 
-from settings import RFID_CONFIG, DEFAULT_RFID_HOSTS, update_rfid_host, reload_config
+from settings import RFID_CONFIG, DEFAULT_RFID_HOSTS, update_rfid_host, reload_config, config_version
 from utils.logger import logger
-from utils.rfid_discovery import discover_rfid_readers
+from utils.rfid_discovery import discover_rfid_readers, stop_arp_scan
 from utils.common import extract_from_gps
 
 
@@ -22,21 +26,110 @@ def _parse_args_from_settings(rfid_cfg):
         'tag_population': rfid_cfg.get('tag_population', 4),
         'impinj_search_mode': rfid_cfg.get('impinj_search_mode', None),
         'impinj_reports': rfid_cfg.get('impinj_reports', False),
+        'arp_scan_line_buffered': rfid_cfg.get('arp_scan_line_buffered', False),
         'port': rfid_cfg.get('port', LLRP_DEFAULT_PORT),
         'host': rfid_cfg.get('host', '127.0.0.1')
     }
     return cfg
 
 
-def _convert_to_unicode(obj):
-    if isinstance(obj, dict):
-        return { _convert_to_unicode(k): _convert_to_unicode(v) for k, v in obj.items() }
-    elif isinstance(obj, list):
-        return [_convert_to_unicode(e) for e in obj]
-    elif isinstance(obj, bytes):
-        return obj.decode('utf-8')
-    else:
-        return obj
+@functools.lru_cache(maxsize=8)
+def _parse_antennas(raw):
+    """Parse a comma-separated antenna list such as '1,2' into a tuple of ints."""
+    return tuple(int(x.strip()) for x in raw.split(','))
+
+
+_cfg_cache = (None, None)
+
+
+def _get_cfg():
+    """Return the parsed RFID settings, re-parsing only after the config has been reloaded."""
+    global _cfg_cache
+    version = config_version()
+    if _cfg_cache[0] != version:
+        _cfg_cache = (version, _parse_args_from_settings(RFID_CONFIG if isinstance(RFID_CONFIG, dict) else {}))
+    return _cfg_cache[1]
+
+
+# The reader sends an LLRP KEEPALIVE every _LLRP_KEEPALIVE_MS; a session with no
+# message for _LLRP_IDLE_TIMEOUT_S is treated as lost (cable pulled, reader off)
+_LLRP_KEEPALIVE_MS = 1000
+_LLRP_IDLE_TIMEOUT_S = 3.0
+
+# Reader config that never varies between reconnects; shared, do not mutate
+_C1G2_SELECTOR = {
+    'EnableCRC': True,
+    'EnablePCBits': True,
+}
+_TAG_CONTENT_SELECTOR = {
+    'EnableROSpecID': True,
+    'EnableSpecIndex': True,
+    'EnableInventoryParameterSpecID': True,
+    'EnableAntennaID': True,
+    'EnableChannelIndex': True,
+    'EnablePeakRSSI': True,
+    'EnableFirstSeenTimestamp': True,
+    'EnableLastSeenTimestamp': True,
+    'EnableTagSeenCount': True,
+    'EnableAccessSpecID': True,
+    'C1G2EPCMemorySelector': _C1G2_SELECTOR,
+}
+_BASE_FACTORY_ARGS = {
+    'start_inventory': True,
+    'tag_content_selector': _TAG_CONTENT_SELECTOR,
+    'impinj_tag_content_selector': None,
+    'keepalive_interval': _LLRP_KEEPALIVE_MS,
+}
+
+_PROBE_TIMEOUT_S = 0.2
+_PROBE_TTL_S = 1.0
+_LLRP_PROBE_TIMEOUT_S = 0.5
+_CONNECT_PENDING = {errno.EINPROGRESS, errno.EWOULDBLOCK, getattr(errno, 'WSAEWOULDBLOCK', errno.EWOULDBLOCK)}
+
+
+def _probe_hosts_batch(hosts, port, timeout=_LLRP_PROBE_TIMEOUT_S):
+    """Open non-blocking TCP connects to port on all hosts and return the first host that accepts, or None."""
+    with contextlib.ExitStack() as stack:
+        sel = stack.enter_context(selectors.DefaultSelector())
+        for host in hosts:
+            try:
+                sock = stack.enter_context(socket.socket(socket.AF_INET, socket.SOCK_STREAM))
+                sock.setblocking(False)
+                err = sock.connect_ex((host, port))
+            except OSError:
+                continue
+            if err == 0:
+                return host
+            if err in _CONNECT_PENDING:
+                sel.register(sock, selectors.EVENT_WRITE, host)
+        deadline = time.monotonic() + timeout
+        while sel.get_map():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            for key, _ in sel.select(remaining):
+                if key.fileobj.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) == 0:
+                    return key.data
+                sel.unregister(key.fileobj)
+    return None
+
+
+def _probe_host(host, port, timeout=_PROBE_TIMEOUT_S):
+    """Return True if a TCP connection to host:port completes within timeout."""
+    return _probe_hosts_batch((host,), port, timeout) is not None
+
+
+def _decode_tag_inplace(tag):
+    """Decode bytes values of an LLRP tag report dict in place and return it."""
+    for key, value in tag.items():
+        if isinstance(value, (bytes, bytearray)):
+            tag[key] = value.decode('utf-8')
+        elif isinstance(value, dict):
+            _decode_tag_inplace(value)
+        elif isinstance(value, list):
+            tag[key] = [v.decode('utf-8') if isinstance(v, (bytes, bytearray)) else
+                        _decode_tag_inplace(v) if isinstance(v, dict) else v for v in value]
+    return tag
 
 
 class RFID(QThread):
@@ -49,10 +142,16 @@ class RFID(QThread):
         self.tag_data = None
         self.connectivity = None
         self.reader = None
-        self._cfg = _parse_args_from_settings(RFID_CONFIG if isinstance(RFID_CONFIG, dict) else {})
+        self._reader_orphaned = False
+        self._cfg = _get_cfg()
         self.host = self._cfg['host']
         self._set_reader(self.host, False)
         self._discovery_in_progress = False
+        self._last_probe_ts = 0.0
+        self._last_rx = 0.0  # monotonic time of the last message from the reader
+        self._last_probe_val = False
+        self._tag_pending = False
+        self._scan_proc = None
         self.gps = gps
         self.gps_getter = gps_getter  # Function to get current GPS instance
 
@@ -62,9 +161,13 @@ class RFID(QThread):
     def _set_reader(self, host, status):
         self.connectivity = status
         self.host = host
-        args = _parse_args_from_settings(RFID_CONFIG if isinstance(RFID_CONFIG, dict) else {})
-        enabled_antennas = [int(x.strip()) for x in str(args['antennas']).split(',')]
+        if self.reader is not None:
+            # The previous reader was replaced without _release_reader(); only a global sweep can reach it now
+            self._reader_orphaned = True
+        args = _get_cfg()
+        enabled_antennas = list(_parse_antennas(str(args['antennas'])))
         factory_args = dict(
+            _BASE_FACTORY_ARGS,
             report_every_n_tags=args['every_n'],
             antennas=enabled_antennas,
             tx_power=args['tx_power'],
@@ -72,37 +175,71 @@ class RFID(QThread):
             session=args['session'],
             mode_identifier=args['mode_identifier'],
             tag_population=args['tag_population'],
-            start_inventory=True,
-            tag_content_selector={
-                'EnableROSpecID': True,
-                'EnableSpecIndex': True,
-                'EnableInventoryParameterSpecID': True,
-                'EnableAntennaID': True,
-                'EnableChannelIndex': True,
-                'EnablePeakRSSI': True,
-                'EnableFirstSeenTimestamp': True,
-                'EnableLastSeenTimestamp': True,
-                'EnableTagSeenCount': True,
-                'EnableAccessSpecID': True,
-                'C1G2EPCMemorySelector': {
-                    'EnableCRC': True,
-                    'EnablePCBits': True,
-                }
-            },
             impinj_search_mode=args['impinj_search_mode'],
-            impinj_tag_content_selector=None,
         )
 
         port = args['port']
         config = LLRPReaderConfig(factory_args)
         self.reader = LLRPReaderClient(host, port, config)
         self.reader.add_tag_report_callback(self.tag_seen_callback)
+        self.reader.add_message_callback('KEEPALIVE', self._on_keepalive)
         logger.debug("RFID initialized.")
 
+    def _track_scan_proc(self, proc):
+        """Remember the running arp-scan so stop() can kill it."""
+        self._scan_proc = proc
+        # stop() may have run before the process was registered
+        if self._b_stop.is_set():
+            stop_arp_scan(proc)
+
+    def _release_reader(self):
+        """Disconnect the current reader, falling back to a global sweep if an older one was orphaned."""
+        reader, self.reader = self.reader, None
+        try:
+            if self._reader_orphaned:
+                self._reader_orphaned = False
+                LLRPReaderClient.disconnect_all_readers()
+            elif reader is not None:
+                reader.disconnect(timeout=1)
+                reader.hard_disconnect()
+        except Exception as e:
+            logger.debug(f"Error disconnecting RFID reader: {e}")
+
+    def _connect_reader(self):
+        self.reader.connect()
+        # Start the idle deadline from the connect, before the first keepalive arrives
+        self._last_rx = time.monotonic()
+
+    def _on_keepalive(self, reader, msg):
+        self._last_rx = time.monotonic()
+
+    def _host_reachable(self):
+        """Check the reader: LLRP idle deadline while connected, otherwise TCP-probe its port.
+
+        While connected the session must have delivered a message (keepalive or tag report)
+        within _LLRP_IDLE_TIMEOUT_S; the port is not probed then because readers accept a single
+        LLRP client and may report or refuse extra connections. Probe results are cached for
+        _PROBE_TTL_S.
+        """
+        now = time.monotonic()
+        if self.connectivity is True and self.reader is not None:
+            return self.reader.is_alive() and now - self._last_rx < _LLRP_IDLE_TIMEOUT_S
+        if now - self._last_probe_ts >= _PROBE_TTL_S:
+            self._last_probe_val = _probe_host(self.host, self._cfg['port'])
+            self._last_probe_ts = now
+        return self._last_probe_val
+
+    def take_tag_data(self):
+        """Return the latest tag data and re-arm the tag signal."""
+        self._tag_pending = False
+        return self.tag_data
+
     def tag_seen_callback(self, reader, tags):
         if tags:
             # logger.debug(f"RFID tags detected: {len(tags)} tags")
-            converted_tags = _convert_to_unicode(tags)
+            # Only the first tag of a report is used, so only decode that one
+            first = tags[0] if isinstance(tags, list) else tags
+            tag_dict = _decode_tag_inplace(first) if isinstance(first, dict) else first
             # Get GPS data if available - use getter function if available, otherwise use direct reference
             lat, lon, speed, bearing = 0, 0, 0, 0
             gps_instance = self.gps_getter() if self.gps_getter else self.gps
@@ -117,16 +254,13 @@ class RFID(QThread):
             lat = round(lat, 7)
             lon = round(lon, 7)
             # Structure: [tag_dict, lat, lon, speed, bearing]
-            # For multiple tags, use the first one
-            if isinstance(converted_tags, list) and len(converted_tags) > 0:
-                tag_dict = converted_tags[0]
-            elif isinstance(converted_tags, dict):
-                tag_dict = converted_tags
-            else:
-                tag_dict = converted_tags
+            self._last_rx = time.monotonic()
             self.tag_data = [tag_dict, lat, lon, speed, bearing]
             # logger.debug(f"Tag data: {self.tag_data}")
-            self.sig_msg.emit(3)
+            # Coalesce: while a tag signal is still queued, the receiver will pick up this newer tag_data
+            if not self._tag_pending:
+                self._tag_pending = True
+                self.sig_msg.emit(3)
         else:
             logger.debug("RFID callback called but no tags found")
 
@@ -144,7 +278,7 @@ class RFID(QThread):
         while not self._b_stop.is_set() and connection_attempts < max_initial_attempts:
             try:
                 logger.debug("Attempting RFID reader connection...")
-                self.reader.connect()
+                self._connect_reader()
                 logger.info("RFID reader connected successfully")
                 self.connectivity = True
                 self.sig_msg.emit(1)
@@ -159,32 +293,23 @@ class RFID(QThread):
                     # Handle None case - ensure it's set to False and emit Disconnected
                     self.connectivity = False
                     self.sig_msg.emit(2)
-            time.sleep(.1)
+            self._b_stop.wait(.1)
         
-        # If initial connection failed, check ping and trigger discovery
+        # If initial connection failed, probe the LLRP port and trigger discovery
         if self.connectivity is False and not self._b_stop.is_set():
             logger.info("Initial connection attempts failed, checking network connectivity and starting discovery")
-            # Check if host is reachable via ping
-            try:
-                response_time = ping(self.host, timeout=3)
-                if response_time is None:
-                    logger.info("Host is not reachable, starting RFID discovery")
-                    if not self._discovery_in_progress:
-                        self._attempt_discovery()
-            except Exception:
-                logger.info("Ping failed, starting RFID discovery")
+            if not self._host_reachable():
+                logger.info("Host is not reachable, starting RFID discovery")
                 if not self._discovery_in_progress:
                     self._attempt_discovery()
 
         while not self._b_stop.is_set():
             try:
-                response_time = ping(self.host, timeout=3)
-                if response_time is not None:
+                if self._host_reachable():
                     if self.connectivity is False:
-                        LLRPReaderClient.disconnect_all_readers()
-                        self.reader = None
+                        self._release_reader()
                         self._set_reader(self.host, True)
-                        self.reader.connect()
+                        self._connect_reader()
                         self.sig_msg.emit(1)
                         # Reset discovery tracking when connection is restored
                         self._discovery_in_progress = False
@@ -192,7 +317,7 @@ class RFID(QThread):
                     if self.connectivity is True:
                         self.connectivity = False
                         self.sig_msg.emit(2)
-                    # Check if we should trigger discovery: disconnected and ping failed
+                    # Check if we should trigger discovery: disconnected and probe failed
                     elif self.connectivity is False:
                         # Continuously attempt discovery if not already in progress
                         if not self._discovery_in_progress:
@@ -201,12 +326,12 @@ class RFID(QThread):
                 if self.connectivity is True:
                     self.connectivity = False
                     self.sig_msg.emit(2)
-                # Also check for discovery on ping exceptions
+                # Also check for discovery on reconnect exceptions
                 elif self.connectivity is False:
                     # Continuously attempt discovery if not already in progress
                     if not self._discovery_in_progress:
                         self._attempt_discovery()
-            time.sleep(.1)
+            self._b_stop.wait(.1)
 
     def _attempt_discovery(self):
         """Attempt to discover a new RFID reader when disconnected. Runs continuously until a reader is found."""
@@ -215,49 +340,27 @@ class RFID(QThread):
         
         self._discovery_in_progress = True
         logger.info("======= RFID DISCOVERY PROCESS STARTED =======")
-        logger.info("RFID disconnected and ping failed - starting continuous discovery for RFID reader")
+        logger.info("RFID disconnected and probe failed - starting continuous discovery for RFID reader")
         logger.info("Discovery will run continuously until a reader is found (like 'gpt_find.py')")
         
         # Keep trying until we find a reader or connection is restored
         while not self._b_stop.is_set() and self.connectivity is False:
             try:
-                new_host = None
-                
-                # First, try default RFID hosts by attempting actual connection
+                # First, check the default RFID hosts for an open LLRP port, all at once
                 logger.info(f"Trying default RFID hosts: {DEFAULT_RFID_HOSTS}")
-                for default_host in DEFAULT_RFID_HOSTS:
-                    if self._b_stop.is_set():
-                        break
-                    
-                    logger.info(f"Attempting to connect to default host: {default_host}")
-                    try:
-                        # Create a temporary reader to test connection
-                        test_config = LLRPReaderConfig({
-                            'report_every_n_tags': 1,
-                            'antennas': [1],
-                            'start_inventory': False  # Don't start inventory for testing
-                        })
-                        test_reader = LLRPReaderClient(default_host, self._cfg['port'], test_config)
-                        
-                        # Try to connect with a short timeout
-                        test_reader.connect()
-                        logger.info(f"Successfully connected to default host {default_host} - this is an RFID reader!")
-                        
-                        # Disconnect the test reader
-                        try:
-                            test_reader.disconnect()
-                        except Exception:
-                            pass
-                        
-                        new_host = default_host
-                        break
-                    except Exception as e:
-                        logger.debug(f"Default host {default_host} connection failed: {e}")
+                new_host = _probe_hosts_batch(DEFAULT_RFID_HOSTS, self._cfg['port'])
+                if new_host:
+                    logger.info(f"LLRP port open on default host {new_host} - this is an RFID reader!")
                 
                 # If no default host connected, try arp-scan discovery
                 if not new_host:
                     logger.info("All default hosts failed to connect, running arp-scan discovery")
-                    new_host = discover_rfid_readers(interface="eth0", subnet="169.254.0.0/16")
+                    try:
+                        new_host = discover_rfid_readers(interface="eth0", subnet="169.254.0.0/16",
+                                                         on_start=self._track_scan_proc,
+                                                         line_buffered=self._cfg['arp_scan_line_buffered'])
+                    finally:
+                        self._scan_proc = None
                 
                 if new_host:
                     if new_host != self.host:
@@ -268,22 +371,17 @@ class RFID(QThread):
                             # Reload config to get updated host
                             reload_config()
                             # Update local config
-                            self._cfg = _parse_args_from_settings(RFID_CONFIG if isinstance(RFID_CONFIG, dict) else {})
+                            self._cfg = _get_cfg()
                             
                             # Disconnect current reader and set up new one
-                            try:
-                                LLRPReaderClient.disconnect_all_readers()
-                            except Exception:
-                                pass
-                            
-                            self.reader = None
+                            self._release_reader()
                             self.host = new_host
                             self._set_reader(self.host, False)
                             
                             # Attempt to connect to the new reader
                             try:
                                 logger.info(f"Attempting to connect to newly discovered reader at {self.host}")
-                                self.reader.connect()
+                                self._connect_reader()
                                 self.connectivity = True
                                 self.sig_msg.emit(1)
                                 logger.info(f"Successfully connected to newly discovered RFID reader at {self.host}")
@@ -299,17 +397,12 @@ class RFID(QThread):
                     else:
                         # Same host discovered - try to reconnect (network issue may be resolved)
                         logger.info(f"Discovered reader is the same as current host: {self.host}, attempting to reconnect")
-                        try:
-                            LLRPReaderClient.disconnect_all_readers()
-                        except Exception:
-                            pass
-                        
-                        self.reader = None
+                        self._release_reader()
                         self._set_reader(self.host, False)
                         
                         try:
                             logger.info(f"Attempting to reconnect to reader at {self.host}")
-                            self.reader.connect()
+                            self._connect_reader()
                             self.connectivity = True
                             self.sig_msg.emit(1)
                             logger.info(f"Successfully reconnected to RFID reader at {self.host}")
@@ -321,13 +414,13 @@ class RFID(QThread):
                             # Continue discovery loop to retry
                 else:
                     logger.debug("No RFID reader found during discovery, retrying...")
-                    # Small delay before retry to avoid tight loop (but still continuous)
-                    time.sleep(1)
+                    # Wait before retry to avoid a tight loop; stop() wakes this immediately
+                    self._b_stop.wait(1)
                     
             except Exception as e:
                 logger.error(f"Error during RFID discovery: {e}")
                 # Small delay before retry on error
-                time.sleep(1)
+                self._b_stop.wait(1)
         
         self._discovery_in_progress = False
         if self.connectivity is True:
@@ -337,7 +430,11 @@ class RFID(QThread):
 
     def stop(self):
         self._b_stop.set()
+        # Abort a running arp-scan so discovery returns and wait() does not block on it
+        scan_proc = self._scan_proc
+        if scan_proc is not None:
+            stop_arp_scan(scan_proc)
         self.wait()
-        LLRPReaderClient.disconnect_all_readers()
+        self._release_reader()
 
 
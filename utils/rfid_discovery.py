@@ -5,16 +5,20 @@ This module provides functionality to discover RFID readers on the network
 using arp-scan to find devices with Impinj or Zebra vendors.
 """
 
+import os
 import re
 import shutil
+import signal
 import subprocess
 import platform
-from typing import List, Dict, Optional
+from collections import deque
+from contextlib import closing
+from typing import Callable, Iterable, Iterator, Optional, Tuple
 
 from utils.logger import logger
 
 ARP_LINE_RE = re.compile(
-    r"^\s*(?P<ip>(?:\d{1,3}\.){3}\d{1,3})\s+(?P<mac>(?:[0-9A-Fa-f]{2}[:\-]){5}[0-9A-Fa-f]{2})\s*(?P<vendor>.*)$"
+    rb"^[ \t]*(?P<ip>(?:\d{1,3}\.){3}\d{1,3})[ \t]+(?P<mac>(?:[0-9A-Fa-f]{2}[:\-]){5}[0-9A-Fa-f]{2})[ \t]*(?P<vendor>[^\n]*)$"
 )
 
 
@@ -23,17 +27,87 @@ def check_arp_scan_available() -> bool:
     return shutil.which("arp-scan") is not None
 
 
-def run_arp_scan(interface: str, subnet: str, use_sudo: bool = True) -> str:
+def stop_arp_scan(proc: subprocess.Popen, timeout: float = 1) -> None:
     """
-    Runs arp-scan and returns stdout as text.
+    Terminate an arp-scan started by run_arp_scan together with its process group.
+    
+    Args:
+        proc: The arp-scan process
+        timeout: Seconds to wait for a graceful exit before killing it
+    """
+    if proc.poll() is not None:
+        return
+    if not _signal_arp_scan(proc, force=False):
+        logger.warning(f"Not permitted to stop arp-scan (pid {proc.pid}); leaving it to finish on its own")
+        return
+    try:
+        proc.wait(timeout)
+        return
+    except subprocess.TimeoutExpired:
+        pass
+    if not _signal_arp_scan(proc, force=True):
+        logger.warning(f"Not permitted to kill arp-scan (pid {proc.pid}); leaving it to finish on its own")
+        return
+    try:
+        proc.wait(timeout)
+    except subprocess.TimeoutExpired:
+        logger.warning(f"arp-scan (pid {proc.pid}) did not exit after SIGKILL")
+
+
+def _signal_arp_scan(proc: subprocess.Popen, force: bool) -> bool:
+    """
+    Terminate (or kill if force) the arp-scan process group, or the direct child
+    where there are no process groups. Returns False if the signal could not be delivered.
+    """
+    killpg = getattr(os, "killpg", None)
+    try:
+        if killpg:
+            killpg(proc.pid, signal.SIGKILL if force else signal.SIGTERM)
+        elif force:
+            proc.kill()
+        else:
+            proc.terminate()
+        return True
+    except ProcessLookupError:
+        return True  # Already exited
+    except PermissionError:
+        # Started through sudo by a non-root user: only root may signal it
+        return _sudo_signal_group(proc.pid, force)
+    except OSError:
+        return False
+
+
+def _sudo_signal_group(pgid: int, force: bool) -> bool:
+    """Signal a root-owned process group through sudo; -n fails instead of prompting for a password."""
+    cmd = ["sudo", "-n", "kill", "-KILL" if force else "-TERM", "--", f"-{pgid}"]
+    try:
+        result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=2)
+    except (OSError, subprocess.TimeoutExpired):
+        return False
+    return result.returncode == 0
+
+
+def run_arp_scan(interface: str, subnet: str, use_sudo: bool = True,
+                 on_start: Optional[Callable[[subprocess.Popen], None]] = None,
+                 line_buffered: bool = False) -> Iterator[bytes]:
+    """
+    Runs arp-scan and yields its stdout lines as raw bytes while the scan is running.
+    
+    arp-scan runs in its own session, so it can be killed as a group with stop_arp_scan
+    from another thread. Closing the generator early terminates the scan. stderr is merged
+    into stdout so a chatty stderr cannot fill an unread pipe.
     
     Args:
         interface: Network interface to use (e.g., 'eth0')
         subnet: Subnet to scan in CIDR notation (e.g., '169.254.0.0/16')
         use_sudo: Whether to run with sudo (required on Linux)
+        on_start: Called with the Popen object once arp-scan has been started
+        line_buffered: Run arp-scan under `stdbuf -oL` so lines arrive as replies come in
+            instead of in 4 KB blocks. With sudo this changes the privileged command line,
+            so sudoers must permit `stdbuf -oL arp-scan ...` too.
     
-    Returns:
-        stdout output from arp-scan
+    Yields:
+        stdout lines from arp-scan
     
     Raises:
         RuntimeError: If arp-scan is not found or fails
@@ -41,62 +115,67 @@ def run_arp_scan(interface: str, subnet: str, use_sudo: bool = True) -> str:
     cmd = []
     if use_sudo and platform.system() == "Linux":
         cmd.append("sudo")
-    cmd.extend(["arp-scan", "--interface", interface, subnet])
+    # arp-scan block-buffers stdout into a pipe; optionally force line buffering
+    if line_buffered and shutil.which("stdbuf"):
+        cmd.extend(["stdbuf", "-oL"])
+    # --plain drops the banner and summary lines, --ignoredups drops repeated replies at the source
+    cmd.extend(["arp-scan", "--interface", interface, "--plain", "--ignoredups", subnet])
     
     try:
-        res = subprocess.run(
-            cmd, 
-            check=True, 
-            stdout=subprocess.PIPE, 
-            stderr=subprocess.PIPE, 
-            text=True
-            # No timeout - let arp-scan run as long as needed, just like the gpt_find.py script
-        )
-        return res.stdout
+        # No timeout - let arp-scan run as long as needed, just like the gpt_find.py script
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, start_new_session=True)
     except FileNotFoundError:
         raise RuntimeError("arp-scan not found. Please install arp-scan (e.g. `sudo apt install arp-scan`).")
-    except subprocess.CalledProcessError as e:
-        raise RuntimeError(f"arp-scan failed (rc={e.returncode}). stderr:\n{e.stderr.strip()}")
+    
+    try:
+        if on_start:
+            on_start(proc)
+        # Keep the last lines for the error message; they include any stderr output
+        tail = deque(maxlen=10)
+        for line in proc.stdout:
+            tail.append(line)
+            yield line
+        rc = proc.wait()
+        if rc != 0:
+            output = b"".join(tail).decode(errors='replace').strip()
+            raise RuntimeError(f"arp-scan failed (rc={rc}). output:\n{output}")
+    finally:
+        stop_arp_scan(proc)
+        proc.stdout.close()
 
 
-def parse_arp_scan_output(output: str) -> List[Dict[str, str]]:
+def parse_first_rfid(lines: Iterable[bytes], valid_vendors=(b"impinj", b"zebra")) -> Optional[Tuple[str, str]]:
     """
-    Parse arp-scan output lines.
+    Find the first arp-scan line whose vendor matches an RFID reader vendor.
     
     Args:
-        output: Raw output from arp-scan
+        lines: arp-scan output lines, e.g. as streamed by run_arp_scan
+        valid_vendors: Lowercase vendor substrings to look for
     
     Returns:
-        List of dicts with 'ip', 'mac', and 'vendor' keys
+        (ip, vendor) of the first matching device, or None if none matched
     """
-    results = []
-    seen_ips = set()  # Track unique IPs to avoid duplicates
-    
-    for line in output.splitlines():
+    for line in lines:
         m = ARP_LINE_RE.match(line)
         if not m:
             continue
-        
-        ip = m.group("ip")
-        # Skip duplicates (arp-scan can show the same IP multiple times)
-        if ip in seen_ips:
-            continue
-        seen_ips.add(ip)
-        
-        mac = m.group("mac").lower()
-        vendor = m.group("vendor").strip() or "Unknown"
-        results.append({"ip": ip, "mac": mac, "vendor": vendor})
-    
-    return results
+        vendor = m["vendor"].lower()
+        if any(v in vendor for v in valid_vendors):
+            return m["ip"].decode("ascii"), m["vendor"].decode("utf-8", "replace").strip()
+    return None
 
 
-def discover_rfid_readers(interface: str = "eth0", subnet: str = "169.254.0.0/16") -> Optional[str]:
+def discover_rfid_readers(interface: str = "eth0", subnet: str = "169.254.0.0/16",
+                          on_start: Optional[Callable[[subprocess.Popen], None]] = None,
+                          line_buffered: bool = False) -> Optional[str]:
     """
     Discover RFID readers on the network by scanning for Impinj or Zebra devices.
     
     Args:
         interface: Network interface to use (default: 'eth0')
         subnet: Subnet to scan in CIDR notation (default: '169.254.0.0/16')
+        on_start: Passed to run_arp_scan, e.g. to keep the process for stop_arp_scan
+        line_buffered: Passed to run_arp_scan
     
     Returns:
         IP address of first found RFID reader, or None if none found
@@ -113,21 +192,13 @@ def discover_rfid_readers(interface: str = "eth0", subnet: str = "169.254.0.0/16
     try:
         logger.info(f"======= RFID DISCOVERY STARTED =======")
         logger.info(f"Scanning for RFID readers on {interface}, subnet {subnet}")
-        raw_output = run_arp_scan(interface, subnet)
-        results = parse_arp_scan_output(raw_output)
-        
-        logger.debug(f"Found {len(results)} devices during scan")
-        
-        # Look for Impinj or Zebra devices
-        valid_vendors = ["Impinj", "Zebra"]
-        for device in results:
-            vendor = device.get("vendor", "")
-            ip = device.get("ip", "")
-            
-            # Check if vendor contains any of our target vendors
-            if any(target_vendor.lower() in vendor.lower() for target_vendor in valid_vendors):
-                logger.info(f"Found RFID reader: {ip} ({vendor})")
-                return ip
+        # Stop the scan as soon as an Impinj or Zebra device shows up
+        with closing(run_arp_scan(interface, subnet, on_start=on_start, line_buffered=line_buffered)) as lines:
+            found = parse_first_rfid(lines)
+        if found:
+            ip, vendor = found
+            logger.info(f"Found RFID reader: {ip} ({vendor})")
+            return ip
         
         logger.debug("No RFID readers (Impinj/Zebra) found during scan")
         return None